@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Parallel backfill of a fresh or rebuilt destination board, partitioned by group
+
+A normal sync reads the source board through one items_page cursor chain, which
+is serial. The backfill enumerates the source board's groups instead and gives
+each group its own cursor and worker thread. Each worker creates its items as
+batched create_item mutations in the destination group with the same title.
+Groups missing on the destination board are created up front.
+
+Source items that already have a destination copy are skipped, so a backfill
+that was interrupted or had failed batches can simply be run again.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Set
+
+from board_model import column_text
+from label_provisioning import LabelProvisioner
+
+logger = logging.getLogger(__name__)
+
+# create_item mutations per request
+DEFAULT_BATCH_SIZE = 25
+
+
+class GroupBackfill:
+    """Copies every source item missing on the destination board, one worker per group"""
+
+    def __init__(self, syncer, workers: int = 4, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.syncer = syncer
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        # Group workers provision labels and resolve links one at a time
+        self._lock = threading.Lock()
+
+    def get_groups(self, board_id: str) -> List[Dict[str, str]]:
+        """Groups of a board in board order"""
+        query = """
+        query ($boardId: [ID!]) {
+            boards(ids: $boardId) {
+                groups {
+                    id
+                    title
+                }
+            }
+        }
+        """
+        result = self.syncer._execute_query(query, {"boardId": board_id})
+        boards = result.get("data", {}).get("boards") or []
+        return boards[0]["groups"] if boards else []
+
+    def create_group(self, board_id: str, title: str) -> str:
+        query = """
+        mutation ($boardId: ID!, $groupName: String!) {
+            create_group(board_id: $boardId, group_name: $groupName) {
+                id
+            }
+        }
+        """
+        result = self.syncer._execute_query(query, {"boardId": board_id, "groupName": title})
+        group_id = result["data"]["create_group"]["id"]
+        logger.info(f"Created destination group '{title}' (ID: {group_id})")
+        return group_id
+
+    def map_groups(self, source_groups: List[Dict[str, str]]) -> Dict[str, str]:
+        """Source group ID -> destination group ID with the same title, creating missing groups"""
+        dest_by_title = {group["title"]: group["id"] for group in self.get_groups(self.syncer.dest_board_id)}
+        mapping = {}
+        for group in source_groups:
+            if group["title"] not in dest_by_title:
+                dest_by_title[group["title"]] = self.create_group(self.syncer.dest_board_id, group["title"])
+            mapping[group["id"]] = dest_by_title[group["title"]]
+        return mapping
+
+    def existing_source_ids(self) -> Set[str]:
+        """Source item IDs that already have a destination copy"""
+        existing = set()
+        for page in self.syncer.iter_board_item_pages(self.syncer.dest_board_id):
+            for item in page:
+                source_id = column_text(item, self.syncer.source_item_id_column)
+                if source_id:
+                    existing.add(source_id)
+        return existing
+
+    def create_batch(self, group_id: str, items: List[Any], columns_info: Dict) -> Dict[str, str]:
+        """Create items in one destination group with one aliased mutation; returns source ID -> new item ID"""
+        definitions = ["$boardId: ID!", "$groupId: String!"]
+        fields = []
+        variables: Dict[str, Any] = {"boardId": self.syncer.dest_board_id, "groupId": group_id}
+        for position, item in enumerate(items):
+            payload, _ = self.syncer.build_payload(item, columns_info)
+            definitions += [f"$name{position}: String!", f"$values{position}: JSON!"]
+            variables[f"name{position}"] = item["name"]
+            variables[f"values{position}"] = payload
+            fields.append(
+                f"c{position}: create_item(board_id: $boardId, group_id: $groupId, "
+                f"item_name: $name{position}, column_values: $values{position}) {{ id }}"
+            )
+        query = "mutation (%s) {\n    %s\n}" % (", ".join(definitions), "\n    ".join(fields))
+        data = self.syncer._execute_query(query, variables).get("data") or {}
+        return {
+            item["id"]: str(data[f"c{position}"]["id"])
+            for position, item in enumerate(items) if data.get(f"c{position}")
+        }
+
+    def backfill_group(self, group: Dict[str, str], dest_group_id: str, columns_info: Dict,
+                       existing: Set[str]) -> Dict[str, int]:
+        """Read one source group page by page and create its missing items in batches"""
+        syncer = self.syncer
+        stats = {"items_created": 0, "items_existing": 0, "labels_created": 0, "errors": 0}
+        for page in syncer.iter_board_item_pages(syncer.source_board_id, query_params=syncer.source_filter,
+                                                 group_id=group["id"]):
+            page = [item for item in page if syncer._in_shard(item)]
+            missing = [item for item in page if item["id"] not in existing]
+            stats["items_existing"] += len(page) - len(missing)
+            if not missing:
+                continue
+            with self._lock:
+                syncer._provision_labels(missing, stats)
+                syncer._resolve_links(missing)
+            for start in range(0, len(missing), self.batch_size):
+                if syncer.lease_is_lost():
+                    logger.error(f"Group '{group['title']}': run lease lost, stopping; run the backfill again "
+                                 f"to create the rest")
+                    return stats
+                batch = missing[start:start + self.batch_size]
+                try:
+                    created = self.create_batch(dest_group_id, batch, columns_info)
+                    stats["items_created"] += len(created)
+                    if len(created) < len(batch):
+                        logger.error(f"Group '{group['title']}': {len(batch) - len(created)} of {len(batch)} "
+                                     f"item(s) in a batch were not created")
+                        stats["errors"] += len(batch) - len(created)
+                    if syncer.link_translator is not None:
+                        # Items created later in the backfill can link to these right away
+                        with self._lock:
+                            syncer.link_translator.record(created)
+                except Exception as e:
+                    # Not retried item by item: part of the batch may have been created
+                    logger.error(f"Group '{group['title']}': batch of {len(batch)} item(s) failed: {e}")
+                    stats["errors"] += len(batch)
+        logger.info(f"Group '{group['title']}': {stats}")
+        return stats
+
+    def run(self) -> Dict[str, int]:
+        syncer = self.syncer
+        columns_info = syncer.get_column_mapping(syncer.source_board_id)
+        source_groups = self.get_groups(syncer.source_board_id)
+        group_mapping = self.map_groups(source_groups)
+        existing = self.existing_source_ids()
+        logger.info(f"Backfilling {len(source_groups)} group(s) with {self.workers} worker(s); "
+                    f"{len(existing)} item(s) already on the destination board")
+
+        if syncer.people_directory is not None:
+            # Loaded once here rather than by whichever worker needs it first
+            syncer.people_directory.snapshot()
+        if syncer.provision_labels:
+            syncer.label_provisioner = LabelProvisioner(syncer)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+                results = list(pool.map(
+                    lambda group: self.backfill_group(group, group_mapping[group["id"]], columns_info, existing),
+                    source_groups
+                ))
+        finally:
+            syncer.label_provisioner = None
+
+        totals = {"groups": len(source_groups), "items_created": 0, "items_existing": 0,
+                  "labels_created": 0, "errors": 0}
+        for stats in results:
+            for key, value in stats.items():
+                totals[key] += value
+        logger.info(f"Backfill finished: {totals}")
+        if totals["errors"]:
+            logger.warning("Some batches failed; run the backfill again to create the missing items")
+        return totals
+
+
+def run_backfill(syncer, args) -> int:
+    """Copy all missing source items into the destination board, groups in parallel"""
+    totals = GroupBackfill(syncer, args.workers, args.batch_size).run()
+    return 1 if totals["errors"] else 0
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Bi-directional sync with per-field three-way diffs
+
+For every synced item pair the state store keeps a base: a checksum per field of
+the value both boards agreed on after the last run. Each run compares source,
+destination and base field by field:
+
+- source changed, destination didn't  -> write the source value to the destination
+- destination changed, source didn't  -> write the destination value back to the source
+- both changed to different values    -> conflict, resolved by the policy
+- neither changed                     -> nothing to do
+
+Items with no changes on either side cost no writes. Source items without a
+destination copy are created as in a normal sync.
+"""
+
+import copy
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from verify import checksum
+from work_scheduler import WorkItem, PRIORITY_NEW
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_POLICIES = ("source", "dest", "skip")
+
+# Compared and written like a column ("name" is accepted in column_values)
+NAME_FIELD = "name"
+
+# Column types that don't flow back to the source board: computed, read-only, or not copied
+# by the sync (files can't be set through column values); links hold destination item IDs
+ONE_WAY_TYPES = {"formula", "auto_number", "item_id", "creation_log", "last_updated", "mirror", "lookup", "name",
+                 "board_relation", "dependency", "file", "button", "subtasks", "time_tracking", "vote"}
+
+# Column types written as plain strings, cleared with ""; all others are cleared with {}
+STRING_VALUE_TYPES = {"text", "numbers", "numeric"}
+
+
+class BidirectionalSync:
+    """Three-way field sync between the source board and its destination copy"""
+
+    def __init__(self, syncer, policy: str = "source"):
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy '{policy}', expected one of {', '.join(CONFLICT_POLICIES)}")
+        self.syncer = syncer
+        self.policy = policy
+        self.namespace = f"bidi_base:{syncer._pair_key()}"
+        # Fields each destination item has been seen holding a value for
+        self.seen_namespace = f"bidi_seen:{syncer._pair_key()}"
+        # Columns the column plan doesn't sync (None) have no way back either
+        self.reverse_mapping = {dest: src for src, dest in syncer.column_id_mapping.items() if dest is not None}
+        self.excluded_columns = {src for src, dest in syncer.column_id_mapping.items() if dest is None}
+        # Destination labels are read as they are and turned back into source labels on the way back
+        self.dest_reader = copy.copy(syncer)
+        self.dest_reader.label_aliases = {}
+        self.reverse_aliases = {
+            col_id: {dest: src for src, dest in table.items()} for col_id, table in syncer.label_aliases.items()
+        }
+        # Source column ID -> type, set by run()
+        self.column_types: Dict[str, str] = {}
+
+    def _source_fields(self, item: Any, columns_info: Dict) -> Dict[str, Any]:
+        """Source item values keyed by destination column ID"""
+        values = self.syncer.prepare_column_values(item, columns_info, verbose=False)
+        values[NAME_FIELD] = item["name"]
+        return values
+
+    def _dest_fields(self, item: Any, columns_info: Dict) -> Dict[str, Any]:
+        """Destination item values for the columns that also exist on the source board"""
+        values = {
+            col_id: value
+            for col_id, value in self.dest_reader.prepare_column_values(item, {}, {}, verbose=False).items()
+            if self.reverse_mapping.get(col_id, col_id) in columns_info
+            and (col_id in self.reverse_mapping or col_id not in self.excluded_columns)
+            and col_id != self.syncer.source_item_id_column
+        }
+        values[NAME_FIELD] = item["name"]
+        return values
+
+    def source_label(self, dest_col_id: str, label: str) -> str:
+        """Source label for a destination status/dropdown label, undoing LABEL_ALIASES"""
+        for table in (self.reverse_aliases.get(dest_col_id), self.reverse_aliases.get("*")):
+            if table and label in table:
+                return table[label]
+        return label
+
+    def _to_source_value(self, dest_col_id: str, value: Any) -> Any:
+        if isinstance(value, dict) and "label" in value:
+            return {"label": self.source_label(dest_col_id, value["label"])}
+        if isinstance(value, dict) and "labels" in value:
+            return {"labels": [self.source_label(dest_col_id, label) for label in value["labels"]]}
+        return value
+
+    def _clear_value(self, source_col_id: str) -> Any:
+        """What change_multiple_column_values takes to clear a column (None is not a clear)"""
+        return "" if self.column_types.get(source_col_id) in STRING_VALUE_TYPES else {}
+
+    def diff(self, source: Dict[str, Any], dest: Dict[str, Any], base: Optional[Dict[str, str]],
+             writable_source_columns: set, seen: Optional[Set[str]] = None
+             ) -> Tuple[Dict[str, Any], Dict[str, Any], List[str], Dict[str, str]]:
+        """Three-way diff of one item pair
+
+        seen holds the fields the destination item has ever had a value for; an
+        empty destination field only counts as cleared if it is one of them.
+        Returns (values for the destination, values for the source keyed by source
+        column ID, conflicting fields, new base).
+        """
+        to_dest: Dict[str, Any] = {}
+        to_source: Dict[str, Any] = {}
+        conflicts: List[str] = []
+        new_base: Dict[str, str] = {}
+
+        for field in set(source) | set(dest) | set(base or {}):
+            src_value, dest_value = source.get(field), dest.get(field)
+            src_sum, dest_sum = checksum(src_value), checksum(dest_value)
+            if src_sum == dest_sum:
+                new_base[field] = src_sum
+                continue
+
+            base_sum = (base or {}).get(field)
+            source_changed = base is None or src_sum != base_sum
+            dest_changed = base is not None and dest_sum != base_sum
+            if dest_changed and dest_value is None and field not in (seen or set()):
+                # Never held a value on the destination (e.g. the write didn't take), so nothing was cleared there
+                dest_changed = False
+            source_field = self.reverse_mapping.get(field, field)
+            # Only fields that exist (and can be written) on the source board flow back
+            can_write_source = field == NAME_FIELD or source_field in writable_source_columns
+
+            winner = None
+            if not dest_changed:
+                winner = "source"
+            elif not source_changed:
+                winner = "dest" if can_write_source else "source"
+            else:
+                conflicts.append(field)
+                if self.policy == "source" or (self.policy == "dest" and not can_write_source):
+                    winner = "source"
+                elif self.policy == "dest":
+                    winner = "dest"
+
+            if winner == "source":
+                to_dest[field] = src_value if src_value is not None else self._clear_value(source_field)
+                new_base[field] = src_sum
+            elif winner == "dest":
+                to_source[source_field] = (self._to_source_value(field, dest_value) if dest_value is not None
+                                           else self._clear_value(source_field))
+                new_base[field] = dest_sum
+            elif base_sum is not None:
+                # Unresolved conflict: keep the old base so it is reported again next run
+                new_base[field] = base_sum
+
+        return to_dest, to_source, conflicts, new_base
+
+    def run(self) -> Dict[str, int]:
+        syncer = self.syncer
+        stats = {
+            "items_created": 0,
+            "items_unchanged": 0,
+            "dest_items_updated": 0,
+            "source_items_updated": 0,
+            "conflicts": 0,
+            "errors": 0,
+        }
+        columns_info = syncer.get_column_mapping(syncer.source_board_id)
+        self.column_types = {col_id: col["type"] for col_id, col in columns_info.items()}
+        writable_source_columns = {
+            col_id for col_id, col in columns_info.items() if col["type"] not in ONE_WAY_TYPES
+        }
+
+        source_items = [
+            item for item in syncer.get_board_items(syncer.source_board_id, query_params=syncer.source_filter)
+            if syncer._in_shard(item)
+        ]
+        dest_lookup: Dict[str, Any] = {}
+        syncer._index_dest_items(syncer.get_board_items(syncer.dest_board_id), dest_lookup)
+        syncer._resolve_links(source_items, dest_lookup)
+        bases = syncer.state.items(self.namespace)
+        new_bases: Dict[str, Dict[str, str]] = {}
+        seen_fields = syncer.state.items(self.seen_namespace)
+        new_seen: Dict[str, List[str]] = {}
+
+        for item in source_items:
+            if syncer.lease_is_lost():
+                # Bases of the items done so far are still saved below
+                logger.error("Run lease lost; stopping the bi-directional sync")
+                break
+            source_id = item["id"]
+            source_values = self._source_fields(item, columns_info)
+            dest_item = dest_lookup.get(source_id)
+            try:
+                if dest_item is None:
+                    errors = stats["errors"]
+                    syncer._sync_item(WorkItem(source_item=item, dest_item_id=None, priority=PRIORITY_NEW),
+                                      columns_info, stats)
+                    if stats["errors"] == errors:
+                        new_bases[source_id] = {field: checksum(value) for field, value in source_values.items()}
+                    continue
+
+                dest_values = self._dest_fields(dest_item, columns_info)
+                seen = set(seen_fields.get(source_id, []))
+                seen_now = seen | {field for field, value in dest_values.items() if value is not None}
+                to_dest, to_source, conflicts, new_base = self.diff(
+                    source_values, dest_values, bases.get(source_id), writable_source_columns, seen_now
+                )
+                if conflicts:
+                    stats["conflicts"] += len(conflicts)
+                    logger.warning(f"Item {source_id}: both sides changed {', '.join(sorted(conflicts))} "
+                                   f"(policy: {self.policy})")
+                if to_dest:
+                    logger.info(f"Item {source_id}: source -> destination: {', '.join(sorted(to_dest))}")
+                    syncer.update_item(syncer.dest_board_id, dest_item["id"], to_dest)
+                    stats["dest_items_updated"] += 1
+                if to_source:
+                    logger.info(f"Item {source_id}: destination -> source: {', '.join(sorted(to_source))}")
+                    syncer.update_item(syncer.source_board_id, source_id, to_source)
+                    stats["source_items_updated"] += 1
+                if not (to_dest or to_source):
+                    stats["items_unchanged"] += 1
+                if new_base != bases.get(source_id):
+                    new_bases[source_id] = new_base
+                if seen_now != seen:
+                    new_seen[source_id] = sorted(seen_now)
+            except Exception as e:
+                # The base isn't advanced, so the same diff is retried next run
+                logger.error(f"Error syncing item '{item['name']}' both ways: {e}")
+                stats["errors"] += 1
+
+        syncer.state.put_many(self.namespace, new_bases)
+        syncer.state.put_many(self.seen_namespace, new_seen)
+        logger.info(f"Bi-directional sync finished: {stats}")
+        return stats
+
+
+def run_bidirectional(syncer, args) -> int:
+    """Sync changes both ways between the source and destination boards"""
+    stats = BidirectionalSync(syncer, args.policy).run()
+    return 1 if stats["errors"] else 0
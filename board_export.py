@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Streaming export of fetched source items to CSV or Parquet files for BI tools
+
+Rows are written page by page as the sync fetches them, so exporting costs no
+extra API calls and never holds more than one page. Files are partitioned by
+sync date: <export_dir>/sync_date=YYYY-MM-DD/board_<id>[...].csv|parquet
+"""
+
+import csv
+import glob
+import json
+import logging
+import os
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from board_model import CompactItem
+
+logger = logging.getLogger(__name__)
+
+# Column types exported as something other than a string
+NUMERIC_TYPES = {"numbers", "numeric"}
+BOOLEAN_TYPES = {"checkbox"}
+DATE_TYPES = {"date"}
+
+# Column types that don't carry exportable data
+SKIPPED_TYPES = {"name"}
+
+
+def _cell(col_type: str, text: Optional[str], raw_value: Optional[str]) -> Any:
+    """Typed value of one column (None when empty or unparseable)"""
+    try:
+        if col_type in NUMERIC_TYPES:
+            return float(text) if text else None
+        if col_type in BOOLEAN_TYPES:
+            parsed = json.loads(raw_value) if raw_value else None
+            return bool(parsed and parsed.get("checked") in (True, "true"))
+        if col_type in DATE_TYPES:
+            parsed = json.loads(raw_value) if raw_value else None
+            return date.fromisoformat(parsed["date"]) if parsed and parsed.get("date") else None
+    except (ValueError, TypeError, KeyError):
+        return None
+    return text or None
+
+
+class BoardExporter:
+    """Writes source items to a date-partitioned CSV or Parquet file, one page at a time"""
+
+    def __init__(self, export_dir: str, board_id: str, columns_info: Dict[str, Dict],
+                 fmt: str = "csv", mode: str = "append", file_suffix: str = "",
+                 sync_time: Optional[datetime] = None):
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unknown export format '{fmt}', expected 'csv' or 'parquet'")
+        if mode not in ("append", "overwrite"):
+            raise ValueError(f"Unknown export mode '{mode}', expected 'append' or 'overwrite'")
+
+        self.fmt = fmt
+        self.mode = mode
+        self.sync_time = sync_time or datetime.now()
+        self.columns: List[Tuple[str, str]] = [
+            (col_id, col["type"]) for col_id, col in columns_info.items() if col["type"] not in SKIPPED_TYPES
+        ]
+        self.field_names = ["item_id", "item_name", "synced_at"] + [col_id for col_id, _ in self.columns]
+
+        partition = os.path.join(export_dir, f"sync_date={self.sync_time.date().isoformat()}")
+        os.makedirs(partition, exist_ok=True)
+        self.base_path = os.path.join(partition, f"board_{board_id}{file_suffix}")
+
+        self.rows_written = 0
+        self._file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._arrow_schema = None
+        self.path = self._open()
+
+    def _open(self) -> str:
+        if self.fmt == "csv":
+            return self._open_csv()
+        return self._open_parquet()
+
+    def _open_csv(self) -> str:
+        path = f"{self.base_path}.csv"
+        if self.mode == "append" and os.path.exists(path) and not self._same_header(path):
+            # The board's columns changed since the file was started; don't mix layouts, but keep
+            # appending to the file an earlier run already started for the new layout
+            rotated = sorted(glob.glob(f"{glob.escape(self.base_path)}-{'[0-9]' * 6}.csv"), reverse=True)
+            matching = [candidate for candidate in rotated if self._same_header(candidate)]
+            if matching:
+                path = matching[0]
+            else:
+                path = f"{self.base_path}-{self.sync_time.strftime('%H%M%S')}.csv"
+                logger.warning(f"Export columns changed, writing to a new file: {path}")
+
+        write_header = self.mode == "overwrite" or not os.path.exists(path)
+        self._file = open(path, "w" if self.mode == "overwrite" else "a", newline="")
+        self._csv_writer = csv.writer(self._file)
+        if write_header:
+            self._csv_writer.writerow(self.field_names)
+        return path
+
+    def _same_header(self, path: str) -> bool:
+        with open(path, newline="") as f:
+            return f.readline().strip() == ",".join(self.field_names)
+
+    def _open_parquet(self) -> str:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from None
+
+        types = {"item_id": pa.string(), "item_name": pa.string(), "synced_at": pa.timestamp("s")}
+        for col_id, col_type in self.columns:
+            if col_type in NUMERIC_TYPES:
+                types[col_id] = pa.float64()
+            elif col_type in BOOLEAN_TYPES:
+                types[col_id] = pa.bool_()
+            elif col_type in DATE_TYPES:
+                types[col_id] = pa.date32()
+            else:
+                types[col_id] = pa.string()
+        self._arrow_schema = pa.schema([(name, types[name]) for name in self.field_names])
+
+        if self.mode == "overwrite":
+            path = f"{self.base_path}.parquet"
+        else:
+            # Parquet files can't be appended to, so each run adds a part file to the partition
+            path = f"{self.base_path}-{self.sync_time.strftime('%H%M%S')}.parquet"
+        self._parquet_writer = pq.ParquetWriter(path, self._arrow_schema)
+        return path
+
+    def _rows(self, items: List[Any]) -> List[List[Any]]:
+        synced_at = self.sync_time.replace(microsecond=0)
+        rows = []
+        for item in items:
+            if isinstance(item, CompactItem):
+                cells = [_cell(col_type, item.text(col_id), item.raw_value(col_id)) for col_id, col_type in self.columns]
+            else:
+                values = {cv["id"]: cv for cv in item["column_values"]}
+                cells = []
+                for col_id, col_type in self.columns:
+                    cv = values.get(col_id)
+                    cells.append(_cell(col_type, cv["text"], cv["value"]) if cv else None)
+            rows.append([item["id"], item["name"], synced_at] + cells)
+        return rows
+
+    def write_page(self, items: List[Any]) -> None:
+        """Append one page of items (one Parquet row group per page)"""
+        if not items:
+            return
+        rows = self._rows(items)
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(
+                [cell.isoformat() if isinstance(cell, (date, datetime)) else cell for cell in row] for row in rows
+            )
+        else:
+            import pyarrow as pa
+            columns = list(zip(*rows))
+            table = pa.Table.from_arrays(
+                [pa.array(list(values), type=field.type) for values, field in zip(columns, self._arrow_schema)],
+                schema=self._arrow_schema
+            )
+            self._parquet_writer.write_table(table)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        logger.info(f"Exported {self.rows_written} items to {self.path}")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory representation of board items for large boards
+
+The API returns every item as a dict with a list of per-column dicts that repeat
+the same id/type keys. CompactItem stores only the per-item data (text and raw JSON
+value) in tuples positioned against a shared BoardSchema, and parses JSON on access.
+CompactItem still supports item["id"], item["name"] and item["column_values"], so it
+can be passed anywhere a raw API item is expected.
+"""
+
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+class BoardSchema:
+    """Column order and types shared by every CompactItem from one board"""
+
+    __slots__ = ("column_ids", "column_types", "index")
+
+    def __init__(self):
+        self.column_ids: List[str] = []
+        self.column_types: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def position(self, col_id: str, col_type: str) -> int:
+        """Slot for a column, adding it to the schema the first time it is seen"""
+        pos = self.index.get(col_id)
+        if pos is None:
+            pos = len(self.column_ids)
+            col_id = sys.intern(col_id)
+            self.column_ids.append(col_id)
+            self.column_types.append(sys.intern(col_type))
+            self.index[col_id] = pos
+        return pos
+
+    def compact(self, item: Dict) -> "CompactItem":
+        """Convert a raw API item into a CompactItem"""
+        texts: List[Optional[str]] = [None] * len(self.column_ids)
+        values: List[Optional[str]] = [None] * len(self.column_ids)
+        for col_value in item["column_values"]:
+            pos = self.position(col_value["id"], col_value["type"])
+            if pos >= len(texts):
+                texts.extend([None] * (pos + 1 - len(texts)))
+                values.extend([None] * (pos + 1 - len(values)))
+            texts[pos] = col_value["text"]
+            values[pos] = col_value["value"]
+        return CompactItem(item["id"], item["name"], self, tuple(texts), tuple(values))
+
+
+class ColumnValue:
+    """Read-only view of one column value, shaped like the API's column_values entries"""
+
+    __slots__ = ("id", "type", "text", "value")
+
+    def __init__(self, col_id: str, col_type: str, text: Optional[str], value: Optional[str]):
+        self.id = col_id
+        self.type = col_type
+        self.text = text
+        self.value = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+
+class CompactItem:
+    """Board item with positional column values and lazily parsed JSON"""
+
+    __slots__ = ("id", "name", "schema", "_texts", "_values")
+
+    def __init__(self, item_id: str, name: str, schema: BoardSchema, texts: tuple, values: tuple):
+        self.id = item_id
+        self.name = name
+        self.schema = schema
+        self._texts = texts
+        self._values = values
+
+    def _slot(self, values: tuple, col_id: str) -> Optional[str]:
+        pos = self.schema.index.get(col_id)
+        if pos is None or pos >= len(values):
+            return None
+        return values[pos]
+
+    def text(self, col_id: str) -> Optional[str]:
+        """Display text of a column"""
+        return self._slot(self._texts, col_id)
+
+    def raw_value(self, col_id: str) -> Optional[str]:
+        """Unparsed JSON value of a column"""
+        return self._slot(self._values, col_id)
+
+    def value(self, col_id: str) -> Any:
+        """Parsed JSON value of a column (parsed on every call, nothing is cached)"""
+        raw = self.raw_value(col_id)
+        return json.loads(raw) if raw else None
+
+    @property
+    def column_values(self) -> List[ColumnValue]:
+        """Column values in API shape, built on demand"""
+        ids, types = self.schema.column_ids, self.schema.column_types
+        return [
+            ColumnValue(ids[pos], types[pos], self._texts[pos], self._values[pos])
+            for pos in range(len(self._texts))
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "id":
+            return self.id
+        if key == "name":
+            return self.name
+        if key == "column_values":
+            return self.column_values
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """Raw API-shaped dict (for serialization)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "column_values": [
+                {"id": cv.id, "type": cv.type, "text": cv.text, "value": cv.value}
+                for cv in self.column_values
+            ],
+        }
+
+
+def column_text(item: Any, col_id: str) -> Optional[str]:
+    """Text of one column for either a raw API item or a CompactItem"""
+    if isinstance(item, CompactItem):
+        return item.text(col_id)
+    for col_value in item["column_values"]:
+        if col_value["id"] == col_id:
+            return col_value["text"]
+    return None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Long-running sync daemon with warm caches and adaptive polling
+
+Instead of a cold start per scheduled run, one process keeps the MondaySync
+client, the source board schema and the destination index in memory and runs
+sync cycles on its own schedule:
+
+- items whose payload is unchanged since the daemon last wrote them are skipped
+- the destination index is updated from the daemon's own creates, and fully
+  refetched (with the schema) every few cycles to pick up outside changes
+- the polling interval halves after a cycle that wrote changes and backs off
+  when the board is idle, with random jitter so several daemons don't align
+"""
+
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from typing import Dict, Optional
+
+from sharding import metrics_path, write_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SyncDaemon:
+    """Runs sync cycles until stopped, adapting the interval to the observed change rate"""
+
+    def __init__(self, syncer, min_interval: float = 60, max_interval: float = 1800,
+                 jitter: float = 0.1, backoff: float = 1.5, refresh_every: int = 12):
+        self.syncer = syncer
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.refresh_every = max(refresh_every, 1)
+        self.interval = min_interval
+        self.cycles = 0
+        self.stopping = threading.Event()
+
+    def refresh_caches(self) -> None:
+        """Refetch the schema and the destination index; forget which payloads were written"""
+        syncer = self.syncer
+        syncer.warm_columns = syncer.get_column_mapping(syncer.source_board_id)
+        if syncer.auto_match_columns:
+            syncer.apply_column_plan(syncer.warm_columns)
+        dest_lookup: Dict = {}
+        for page in syncer.iter_board_item_pages(syncer.dest_board_id):
+            syncer._index_dest_items(page, dest_lookup)
+        syncer.warm_dest_lookup = dest_lookup
+        # Written payloads are only trusted until the next full look at the destination board
+        syncer.written_fingerprints = {}
+        logger.info(f"Daemon caches refreshed: {len(syncer.warm_columns)} columns, {len(dest_lookup)} destination items")
+
+    def next_interval(self, changes: Optional[int]) -> float:
+        """Shrink the interval after changes, back off when idle or after a failed cycle"""
+        if changes:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run_cycle(self) -> Optional[int]:
+        """One sync cycle; returns how many source items changed, or None if the cycle failed"""
+        syncer = self.syncer
+        refreshing = self.cycles % self.refresh_every == 0
+        # Payloads written before the refresh (None before the first cycle)
+        previous = syncer.written_fingerprints
+        try:
+            if refreshing:
+                self.refresh_caches()
+            self.cycles += 1
+            stats = self.syncer.sync_boards()
+        except Exception as e:
+            logger.error(f"Sync cycle {self.cycles} failed: {e}")
+            # Start the next cycle from a clean fetch in case the caches were the problem
+            self.cycles = 0
+            return None
+        write_metrics(stats, metrics_path(os.getenv("SYNC_METRICS_PATH", "sync_metrics.json"), self.syncer.shard),
+                      self.syncer.shard)
+        if not refreshing:
+            # Only items whose payload changed since the last write were written
+            return stats["items_created"] + stats["items_updated"]
+        # A refresh cycle rewrites everything; count only payloads that differ from the ones written before
+        if previous is None:
+            return 0
+        return sum(1 for source_id, fingerprint in syncer.written_fingerprints.items()
+                   if previous.get(source_id) != fingerprint)
+
+    def stop(self, *_args) -> None:
+        logger.info("Daemon stopping after the current cycle")
+        self.stopping.set()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info(f"Sync daemon started (interval {self.min_interval:.0f}-{self.max_interval:.0f}s, "
+                    f"full refresh every {self.refresh_every} cycles)")
+        while not self.stopping.is_set():
+            started = time.monotonic()
+            changes = self.run_cycle()
+            delay = self.next_interval(changes)
+            logger.info(f"Cycle {self.cycles} wrote {changes if changes is not None else 'nothing (failed)'} "
+                        f"item(s) in {time.monotonic() - started:.1f}s; next cycle in {delay:.0f}s")
+            if self.syncer.lease_lost is not None and self.syncer.lease_lost.is_set():
+                logger.error("Run lease was taken over by another process; stopping the daemon")
+                return 1
+            self.stopping.wait(delay)
+        return 0
+
+
+def run_daemon(syncer, args) -> int:
+    """Run the sync daemon until SIGTERM/SIGINT"""
+    return SyncDaemon(
+        syncer,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        jitter=float(os.getenv("SYNC_DAEMON_JITTER", "0.1")),
+        refresh_every=args.refresh_every,
+    ).run()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Dead-letter queue and circuit breaker for item writes
+
+Items whose write fails are parked in the state store with an exponential retry
+delay, so a permanently broken item costs one attempt per backoff period instead
+of one per run. An item is retried right away if its source data changed.
+
+The circuit breaker watches the outcome of recent writes and aborts the run once
+too many of them fail (or on the first authentication error), instead of letting
+a systemic problem burn through every remaining item.
+"""
+
+import collections
+import logging
+import time
+from typing import Callable, Deque, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Error text that means retrying other items is pointless
+AUTH_ERROR_MARKERS = ("not authenticated", "unauthorized", "userunauthorizedexception", "invalid token")
+
+
+class CircuitOpenError(Exception):
+    """Raised to abort a run once the circuit breaker opens"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        # Source IDs the aborted run didn't write, filled in by the write loop
+        self.unfinished: List[str] = []
+
+
+def is_auth_error(error: BaseException) -> bool:
+    """Whether an error means the API token is invalid or lacks access"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        if error.response.status_code in (401, 403):
+            return True
+    message = str(error).lower()
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+class DeadLetterQueue:
+    """Failed items with their retry schedule, persisted per board pair"""
+
+    def __init__(self, state, pair_key: str, base_delay: float = 3600, max_delay: float = 7 * 86400,
+                 clock: Callable[[], float] = time.time):
+        self.state = state
+        self.namespace = f"dead_letter:{pair_key}"
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        # source_id -> {"attempts", "first_failed_at", "next_retry_at", "last_error", "fingerprint"}
+        self.entries: Dict[str, Dict] = state.items(self.namespace)
+        if self.entries:
+            logger.info(f"{len(self.entries)} item(s) in the dead-letter queue")
+
+    def should_skip(self, source_id: str, fingerprint: Optional[str]) -> bool:
+        """Whether an item is still waiting out its retry delay (and hasn't changed since it failed)"""
+        entry = self.entries.get(source_id)
+        if entry is None:
+            return False
+        if fingerprint is not None and fingerprint != entry["fingerprint"]:
+            return False
+        return self.clock() < entry["next_retry_at"]
+
+    def record_failure(self, source_id: str, fingerprint: Optional[str], error: str) -> None:
+        now = self.clock()
+        entry = self.entries.get(source_id) or {"attempts": 0, "first_failed_at": now}
+        entry["attempts"] += 1
+        delay = min(self.base_delay * 2 ** (entry["attempts"] - 1), self.max_delay)
+        entry.update(next_retry_at=now + delay, last_error=error[:500], fingerprint=fingerprint)
+        self.entries[source_id] = entry
+        self.state.put(self.namespace, source_id, entry)
+        logger.warning(f"Item {source_id} failed {entry['attempts']} time(s); next retry in {delay / 3600:.1f}h")
+
+    def record_success(self, source_id: str) -> None:
+        if self.entries.pop(source_id, None) is not None:
+            self.state.delete(self.namespace, source_id)
+            logger.info(f"Item {source_id} succeeded and left the dead-letter queue")
+
+    def clear(self, source_ids: Optional[List[str]] = None) -> int:
+        """Forget some (or all) entries so they are retried on the next run"""
+        ids = list(self.entries) if source_ids is None else [item_id for item_id in source_ids if item_id in self.entries]
+        self.state.delete_many(self.namespace, ids)
+        for item_id in ids:
+            del self.entries[item_id]
+        return len(ids)
+
+
+class CircuitBreaker:
+    """Opens when the error rate over the last `window` writes reaches `error_rate`"""
+
+    def __init__(self, error_rate: float = 0.5, window: int = 20, min_calls: int = 10):
+        self.error_rate = error_rate
+        self.min_calls = min(min_calls, window)
+        self.outcomes: Deque[bool] = collections.deque(maxlen=window)
+
+    def record_success(self) -> None:
+        self.outcomes.append(True)
+
+    def record_failure(self, error: BaseException) -> None:
+        """Count a failed write; raises CircuitOpenError if the run should stop"""
+        self.outcomes.append(False)
+        if is_auth_error(error):
+            raise CircuitOpenError(f"authentication error, aborting run: {error}") from error
+        if self.error_rate <= 0 or len(self.outcomes) < self.min_calls:
+            return
+        failures = self.outcomes.count(False)
+        if failures / len(self.outcomes) >= self.error_rate:
+            raise CircuitOpenError(
+                f"{failures} of the last {len(self.outcomes)} writes failed, aborting run (last error: {error})"
+            ) from error
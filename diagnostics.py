@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Diagnostic subcommands for investigating boards and sync results
+
+These replace the old standalone check_*/inspect_* scripts. They all go through
+the MondaySync client, so they share its HTTP session and rate limiter, and board
+reads come from the on-disk cache (MONDAY_CACHE_TTL_SECONDS) unless --refresh is given.
+"""
+
+import argparse
+import json
+from datetime import datetime
+from typing import Dict, List
+
+from board_model import column_text
+
+
+def _resolve_board(syncer, board: str) -> str:
+    """Accept 'source', 'dest' or a literal board ID"""
+    if board == "source":
+        return syncer.source_board_id
+    if board == "dest":
+        return syncer.dest_board_id
+    return board
+
+
+def _print_columns(columns: Dict[str, Dict]) -> None:
+    print(f"\nCOLUMNS ({len(columns)} total):")
+    print("-" * 80)
+    for col_id, col in columns.items():
+        print(f"  ID: {col_id:<30} | Title: {col['title']:<30} | Type: {col['type']}")
+
+
+def _print_item(item: Dict, raw: bool = False) -> None:
+    board = item.get("board")
+    board_note = f" on board {board['name']} ({board['id']})" if board else ""
+    print(f"\nItem: {item['name']} (ID: {item['id']}){board_note}")
+    print("-" * 80)
+    for col in item["column_values"]:
+        if raw:
+            if col["value"] and col["value"] != "null":
+                print(f"  {col['id']:<30} ({col['type']}): text={col['text']!r}")
+                print(f"  {'':<30} value={col['value']}")
+        elif col["text"]:
+            print(f"  {col['id']:<30} ({col['type']}): {col['text']}")
+
+
+def cmd_boards(syncer, args: argparse.Namespace) -> int:
+    """List boards the API token can access (also a connection test)"""
+    boards = syncer.list_boards(limit=args.limit)
+    print("BOARDS YOU HAVE ACCESS TO:")
+    print("=" * 80)
+    for board in boards:
+        print(f"  ID: {board['id']:<15} | Name: {board['name']}")
+    return 0
+
+
+def cmd_inspect(syncer, args: argparse.Namespace) -> int:
+    """Show columns and sample items of the source and/or destination board"""
+    boards = [args.board] if args.board else ["source", "dest"]
+    for board in boards:
+        board_id = _resolve_board(syncer, board)
+        print(f"\n{'=' * 80}")
+        print(f"INSPECTING {board.upper()} BOARD (ID: {board_id})")
+        print("=" * 80)
+
+        _print_columns(syncer.get_column_mapping_cached(board_id, refresh=args.refresh))
+
+        items = syncer.get_board_items_cached(board_id, refresh=args.refresh)[:args.limit]
+        print(f"\n\nSAMPLE ITEMS ({len(items)} shown):")
+        for item in items:
+            _print_item(item, raw=args.raw)
+            if board_id == syncer.dest_board_id:
+                print(f"    >>> SOURCE_ITEM_ID VALUE: {column_text(item, syncer.source_item_id_column)}")
+    return 0
+
+
+def cmd_items(syncer, args: argparse.Namespace) -> int:
+    """List every item on a board, with its source_item_id when listing the destination board"""
+    board_id = _resolve_board(syncer, args.board)
+    items = syncer.get_board_items_cached(board_id, refresh=args.refresh)
+    if args.name:
+        needles = [name.lower() for name in args.name]
+        items = [item for item in items if any(needle in item["name"].lower() for needle in needles)]
+
+    print(f"\nItems on board {board_id}: {len(items)}\n")
+    print("=" * 100)
+    if board_id != syncer.dest_board_id:
+        for item in items:
+            print(f"  {item['name']:<40} | ID: {item['id']}")
+        return 0
+
+    with_source_id = 0
+    for item in items:
+        source_id = column_text(item, syncer.source_item_id_column)
+        if source_id:
+            with_source_id += 1
+            print(f"✓ {item['name']:<40} | Dest ID: {item['id']} | Source ID: {source_id}")
+        else:
+            print(f"✗ {item['name']:<40} | Dest ID: {item['id']} | Source ID: MISSING")
+    print("\n" + "=" * 100)
+    print(f"Items WITH source_item_id: {with_source_id}")
+    print(f"Items WITHOUT source_item_id: {len(items) - with_source_id}")
+    return 0
+
+
+def cmd_item(syncer, args: argparse.Namespace) -> int:
+    """Show specific items, from the board cache when possible, otherwise from the API"""
+    wanted = set(args.item_ids)
+    found: List[Dict] = []
+    if not args.refresh:
+        for board_id in (syncer.source_board_id, syncer.dest_board_id):
+            cached = syncer.state.get("item_cache", str(board_id), max_age=syncer.cache_ttl_seconds) or []
+            found.extend(item for item in cached if item["id"] in wanted)
+    missing = wanted - {item["id"] for item in found}
+    if missing:
+        found.extend(syncer.get_items(sorted(missing)))
+
+    for item in found:
+        if not args.column:
+            _print_item(item, raw=args.raw)
+            continue
+
+        print(f"\nItem: {item['name']} (ID: {item['id']})")
+        for col in item["column_values"]:
+            if col["id"] != args.column:
+                continue
+            print(f"  {col['id']} ({col['type']}): text={col['text']!r}")
+            print(f"  value={col['value']}")
+            if col["type"] == "file" and col["value"] and col["value"] != "null":
+                files = json.loads(col["value"]).get("files") or []
+                print(f"  {'✓' if files else '✗'} {len(files)} file(s)")
+                for f in files:
+                    print(f"    - {f.get('name', 'Unknown')}")
+            break
+        else:
+            print(f"  Column {args.column} NOT FOUND")
+
+    not_found = wanted - {item["id"] for item in found}
+    for item_id in sorted(not_found):
+        print(f"\nItem {item_id} not found")
+    return 1 if not_found else 0
+
+
+def cmd_dead_letters(syncer, args: argparse.Namespace) -> int:
+    """List items parked in the dead-letter queue, or clear them so the next run retries them"""
+    queue = syncer.dead_letter_queue()
+    if args.clear is not None:
+        cleared = queue.clear(args.clear or None)
+        print(f"Cleared {cleared} item(s) from the dead-letter queue")
+        return 0
+
+    print(f"\nDead-letter queue for {syncer.source_board_id} -> {syncer.dest_board_id}: {len(queue.entries)} item(s)")
+    print("=" * 100)
+    for source_id, entry in sorted(queue.entries.items(), key=lambda pair: pair[1]["next_retry_at"]):
+        retry_at = datetime.fromtimestamp(entry["next_retry_at"]).isoformat(timespec="minutes")
+        print(f"  {source_id:<15} | attempts: {entry['attempts']:<3} | next retry: {retry_at}")
+        print(f"  {'':<15} | {entry['last_error']}")
+    return 0
+
+
+def add_diagnostic_commands(subparsers) -> None:
+    """Register the diagnostic subcommands on the main CLI"""
+    boards_parser = subparsers.add_parser("boards", help="List accessible boards (API connection test)")
+    boards_parser.add_argument("--limit", type=int, default=50)
+    boards_parser.set_defaults(handler=cmd_boards)
+
+    inspect_parser = subparsers.add_parser("inspect", help="Show board columns and sample items")
+    inspect_parser.add_argument("--board", help="'source', 'dest' or a board ID (default: both)")
+    inspect_parser.add_argument("--limit", type=int, default=5, help="Sample items to show per board")
+    inspect_parser.add_argument("--raw", action="store_true", help="Show raw JSON values instead of text")
+    inspect_parser.set_defaults(handler=cmd_inspect)
+
+    items_parser = subparsers.add_parser("items", help="List all items on a board")
+    items_parser.add_argument("--board", default="dest", help="'source', 'dest' (default) or a board ID")
+    items_parser.add_argument("--name", action="append", help="Only items whose name contains this text (repeatable)")
+    items_parser.set_defaults(handler=cmd_items)
+
+    item_parser = subparsers.add_parser("item", help="Show specific items by ID")
+    item_parser.add_argument("item_ids", nargs="+")
+    item_parser.add_argument("--column", help="Only show this column (file columns list their files)")
+    item_parser.add_argument("--raw", action="store_true", help="Show raw JSON values instead of text")
+    item_parser.set_defaults(handler=cmd_item)
+
+    dead_letter_parser = subparsers.add_parser("dead-letters", help="List (or clear) items whose writes keep failing")
+    dead_letter_parser.add_argument("--clear", nargs="*", metavar="SOURCE_ITEM_ID",
+                                    help="Clear these items (or all, if none given) so the next run retries them")
+    dead_letter_parser.set_defaults(handler=cmd_dead_letters)
+
+    for sub in (inspect_parser, items_parser, item_parser):
+        sub.add_argument("--refresh", action="store_true", help="Ignore the on-disk board cache")
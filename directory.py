@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Cached user/team directory for mapping people columns
+
+People columns store user and team IDs. Passing them through unchanged breaks
+for deactivated users and for people who are known under a different account
+on the destination side. The directory fetches all users and teams in bulk
+(once per PEOPLE_DIRECTORY_TTL_SECONDS, cached in the state store) and maps each
+entry of a people column:
+
+1. through PEOPLE_MAP, keyed by source user ID, email or name (team ID or name
+   for teams), to a user given by ID, email or name
+2. otherwise an active user or existing team keeps its ID
+3. otherwise (deactivated or unknown) to PEOPLE_FALLBACK, or it is dropped
+
+The directory is the account the API token belongs to; PEOPLE_MAP targets are
+looked up in it.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Users per page of the users query
+USERS_PAGE_SIZE = 500
+
+
+def _norm(text: Optional[str]) -> str:
+    return (text or "").strip().lower()
+
+
+def parse_people_map(text: str) -> Dict[str, str]:
+    """Parse PEOPLE_MAP ({"old@example.com": "new@example.com", "Jane Doe": "12345", ...})"""
+    if not text.strip():
+        return {}
+    try:
+        table = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"PEOPLE_MAP is not valid JSON: {e}") from None
+    if not isinstance(table, dict):
+        raise ValueError("PEOPLE_MAP must be a JSON object")
+    return {_norm(str(key)): str(value) for key, value in table.items()}
+
+
+class PeopleDirectory:
+    """Users and teams of the account, indexed for mapping people column values"""
+
+    def __init__(self, syncer, people_map: Optional[Dict[str, str]] = None, fallback: str = "",
+                 ttl_seconds: float = 86400):
+        self.syncer = syncer
+        self.people_map = people_map or {}
+        self.fallback = fallback
+        self.ttl_seconds = ttl_seconds
+        self._data: Optional[Dict[str, List[Dict]]] = None
+        # When a snapshot taken by snapshot() goes stale (long-running daemon); handed-over ones don't
+        self._expires_at: Optional[float] = None
+        self._warned: Set[str] = set()
+        self.users: Dict[str, Dict] = {}
+        self.active_by_email: Dict[str, str] = {}
+        self.active_by_name: Dict[str, str] = {}
+        self.teams: Dict[str, Dict] = {}
+        self.teams_by_name: Dict[str, str] = {}
+
+    def _fetch_users(self) -> List[Dict]:
+        query = """
+        query ($limit: Int!, $page: Int!) {
+            users(limit: $limit, page: $page) {
+                id
+                name
+                email
+                enabled
+            }
+        }
+        """
+        users: List[Dict] = []
+        page = 1
+        while True:
+            result = self.syncer._execute_query(query, {"limit": USERS_PAGE_SIZE, "page": page})
+            batch = result.get("data", {}).get("users") or []
+            users.extend(batch)
+            if len(batch) < USERS_PAGE_SIZE:
+                return users
+            page += 1
+
+    def _fetch_teams(self) -> List[Dict]:
+        query = """
+        query {
+            teams {
+                id
+                name
+            }
+        }
+        """
+        result = self.syncer._execute_query(query)
+        return result.get("data", {}).get("teams") or []
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """Users and teams, from the state store while fresh, otherwise fetched and stored"""
+        if self._data is None or (self._expires_at is not None and time.time() >= self._expires_at):
+            data = self.syncer.state.get("directory", "account", max_age=self.ttl_seconds)
+            if data is None:
+                data = {"users": self._fetch_users(), "teams": self._fetch_teams()}
+                self.syncer.state.put("directory", "account", data)
+                logger.info(f"Fetched directory: {len(data['users'])} users, {len(data['teams'])} teams")
+            self.load(data)
+            self._expires_at = time.time() + self.ttl_seconds
+        return self._data
+
+    def load(self, data: Dict[str, List[Dict]]) -> None:
+        """Use this snapshot (e.g. handed to a worker process) and index it"""
+        self._data = data
+        self.users = {str(user["id"]): user for user in data["users"]}
+        active = [user for user in data["users"] if user.get("enabled", True)]
+        self.active_by_email = {_norm(user.get("email")): str(user["id"]) for user in active if user.get("email")}
+        self.active_by_name = {_norm(user.get("name")): str(user["id"]) for user in active}
+        self.teams = {str(team["id"]): team for team in data["teams"]}
+        self.teams_by_name = {_norm(team.get("name")): str(team["id"]) for team in data["teams"]}
+
+    def _warn_once(self, key: str, message: str) -> None:
+        if key not in self._warned:
+            self._warned.add(key)
+            logger.warning(message)
+
+    def resolve_user(self, ref: str) -> Optional[str]:
+        """Active user ID for a user ID, email or name"""
+        if ref in self.users:
+            return ref if self.users[ref].get("enabled", True) else None
+        return self.active_by_email.get(_norm(ref)) or self.active_by_name.get(_norm(ref))
+
+    def map_person(self, user_id: str) -> Optional[str]:
+        user = self.users.get(user_id)
+        keys = [user_id] + ([_norm(user.get("email")), _norm(user.get("name"))] if user else [])
+        for key in keys:
+            if key and key in self.people_map:
+                target = self.resolve_user(self.people_map[key])
+                if target is None:
+                    self._warn_once(f"map:{key}", f"PEOPLE_MAP target '{self.people_map[key]}' is not an active user")
+                return target
+        if user is not None and user.get("enabled", True):
+            return user_id
+
+        target = self.resolve_user(self.fallback) if self.fallback else None
+        reason = "deactivated" if user is not None else "unknown"
+        self._warn_once(f"user:{user_id}", f"People column: {reason} user {user_id} "
+                                           f"{'mapped to ' + target if target else 'dropped'}")
+        return target
+
+    def map_team(self, team_id: str) -> Optional[str]:
+        team = self.teams.get(team_id)
+        for key in [team_id] + ([_norm(team.get("name"))] if team else []):
+            if key and key in self.people_map:
+                target = self.people_map[key]
+                return target if target in self.teams else self.teams_by_name.get(_norm(target))
+        if team is not None:
+            return team_id
+        self._warn_once(f"team:{team_id}", f"People column: unknown team {team_id} dropped")
+        return None
+
+    def map_people(self, people: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """personsAndTeams entries for the destination (duplicates and unmappable entries removed)"""
+        self.snapshot()
+        mapped = []
+        seen = set()
+        for entry in people:
+            kind = entry.get("kind", "person")
+            entry_id = str(entry["id"])
+            target = self.map_team(entry_id) if kind == "team" else self.map_person(entry_id)
+            if target is None or (kind, target) in seen:
+                continue
+            seen.add((kind, target))
+            mapped.append({"id": int(target), "kind": kind})
+        return mapped
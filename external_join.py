@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+External-memory sort-merge join of the source and destination boards
+
+For boards too large to hold both item lists and the destination index in
+memory. Each board is streamed page by page into sorted on-disk runs keyed by
+source item ID (the destination side by its source_item_id column). The runs
+are then merged with heapq.merge and the two sorted streams are joined in a
+single pass:
+
+- source key without a destination item  -> create
+- source key with a destination item      -> update
+- destination key without a source item   -> orphan (counted, left alone)
+
+Only one run is buffered while spilling and one item per run while merging,
+so memory stays flat however large the boards are. Writes happen in key order
+rather than priority order.
+"""
+
+import heapq
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from board_model import CompactItem, column_text
+from dead_letter import CircuitOpenError
+from work_scheduler import WorkScheduler
+
+logger = logging.getLogger(__name__)
+
+# Items buffered in memory before a sorted run is written to disk
+DEFAULT_RUN_ITEMS = 10000
+
+
+def _as_dict(item: Any) -> Dict:
+    return item.to_dict() if isinstance(item, CompactItem) else item
+
+
+def merge_join(left: Iterable[Tuple[str, Any]],
+               right: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Optional[Any], List[Any]]]:
+    """Join two key-sorted streams; yields (key, left record or None, right records)
+
+    Keys are unique on the left; the right side may repeat a key.
+    """
+    left, right = iter(left), iter(right)
+    left_entry = next(left, None)
+    right_entry = next(right, None)
+    while left_entry is not None or right_entry is not None:
+        if right_entry is None or (left_entry is not None and left_entry[0] < right_entry[0]):
+            yield left_entry[0], left_entry[1], []
+            left_entry = next(left, None)
+            continue
+
+        key = right_entry[0]
+        group = []
+        while right_entry is not None and right_entry[0] == key:
+            group.append(right_entry[1])
+            right_entry = next(right, None)
+        if left_entry is not None and left_entry[0] == key:
+            yield key, left_entry[1], group
+            left_entry = next(left, None)
+        else:
+            yield key, None, group
+
+
+class SortedRuns:
+    """Items spilled to sorted run files in one directory, merged back as one sorted stream"""
+
+    def __init__(self, directory: str, prefix: str, run_items: int = DEFAULT_RUN_ITEMS):
+        self.directory = directory
+        self.prefix = prefix
+        self.run_items = max(run_items, 1)
+        self.paths: List[str] = []
+        self.count = 0
+        self._buffer: List[Tuple[str, str]] = []
+
+    def add(self, key: str, item: Any) -> None:
+        self._buffer.append((key, json.dumps(_as_dict(item), separators=(",", ":"))))
+        self.count += 1
+        if len(self._buffer) >= self.run_items:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sort the buffered items and write them out as one run"""
+        if not self._buffer:
+            return
+        self._buffer.sort(key=lambda entry: entry[0])
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):05d}.run")
+        with open(path, "w", encoding="utf-8") as f:
+            for key, record in self._buffer:
+                f.write(f"{key}\t{record}\n")
+        self.paths.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _read(path: str) -> Iterator[Tuple[str, str]]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key, _, record = line.rstrip("\n").partition("\t")
+                yield key, record
+
+    def merged(self) -> Iterator[Tuple[str, Dict]]:
+        """All spilled items in key order"""
+        self.flush()
+        for key, record in heapq.merge(*(self._read(path) for path in self.paths), key=lambda entry: entry[0]):
+            yield key, json.loads(record)
+
+
+class ExternalJoinSync:
+    """Syncs one board pair through on-disk sorted runs instead of an in-memory index"""
+
+    def __init__(self, syncer, scheduler: WorkScheduler, columns_info: Dict, stats: Dict[str, int],
+                 run_items: int = DEFAULT_RUN_ITEMS, work_dir: Optional[str] = None):
+        self.syncer = syncer
+        self.scheduler = scheduler
+        self.columns_info = columns_info
+        self.stats = stats
+        self.run_items = run_items
+        self.work_dir = work_dir
+
+    def _spill(self, runs: SortedRuns, pages: Iterable[List[Any]], key: Callable[[Any], Optional[str]]) -> None:
+        """Write every keyed item of a board to sorted runs (items without a key are skipped)"""
+        for page in pages:
+            for item in page:
+                item_key = key(item)
+                if item_key:
+                    runs.add(item_key, item)
+        runs.flush()
+        logger.info(f"Spilled {runs.count} {runs.prefix} items into {len(runs.paths)} sorted run(s)")
+
+    def _source_pages(self) -> Iterator[List[Any]]:
+        """Source pages after shard and item limit, exported and label-provisioned as they arrive"""
+        syncer = self.syncer
+        remaining = syncer.item_limit or None
+        for page in syncer.iter_board_item_pages(syncer.source_board_id, query_params=syncer.source_filter):
+            page = [item for item in page if syncer._in_shard(item)]
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+            syncer._export_page(page)
+            # Every label exists, and every link is resolved, before the first write
+            syncer._provision_labels(page, self.stats)
+            syncer._resolve_links(page)
+            yield page
+            if remaining == 0:
+                break
+
+    def run(self) -> List[str]:
+        """Spill both boards, then merge-join and write; returns unfinished source IDs"""
+        syncer = self.syncer
+        carried_over = syncer._carried_over_ids()
+        unfinished: List[str] = []
+        orphans = 0
+        stopped = False
+
+        with tempfile.TemporaryDirectory(prefix="monday-join-", dir=self.work_dir) as directory:
+            source_runs = SortedRuns(directory, "source", self.run_items)
+            dest_runs = SortedRuns(directory, "dest", self.run_items)
+            with syncer._phase("spill_source"):
+                self._spill(source_runs, self._source_pages(), lambda item: item["id"])
+            with syncer._phase("spill_dest"):
+                self._spill(dest_runs, syncer.iter_board_item_pages(syncer.dest_board_id),
+                            lambda item: column_text(item, syncer.source_item_id_column))
+
+            with syncer._phase("merge_write"):
+                joined = merge_join(source_runs.merged(), dest_runs.merged())
+                for key, source_item, dest_items in joined:
+                    if source_item is None:
+                        orphans += len(dest_items)
+                        logger.debug(f"Orphaned destination item(s) for source_id={key}: "
+                                     f"{', '.join(item['id'] for item in dest_items)}")
+                        continue
+                    if stopped:
+                        unfinished.append(key)
+                        continue
+
+                    action, wait_seconds, reason = self.scheduler.next_action(
+                        syncer.complexity_remaining, syncer.complexity_reset_in
+                    )
+                    while action == "wait":
+                        logger.info(f"Waiting {wait_seconds:.0f}s for complexity budget reset: {reason}")
+                        time.sleep(wait_seconds)
+                        syncer.complexity_remaining = None
+                        action, wait_seconds, reason = self.scheduler.next_action(None, None)
+                    if action == "stop":
+                        logger.warning(f"Stopping early: {reason}")
+                        stopped = True
+                        unfinished.append(key)
+                        continue
+
+                    # Same duplicate handling (lowest ID wins) as the in-memory index
+                    dest_lookup: Dict[str, Any] = {}
+                    syncer._index_dest_items(dest_items, dest_lookup)
+                    job = syncer._classify(source_item, dest_lookup, carried_over)
+                    try:
+                        syncer._sync_item(job, self.columns_info, self.stats)
+                    except CircuitOpenError as e:
+                        # The rest of the join is unwritten as well
+                        unfinished.append(key)
+                        unfinished.extend(rest_key for rest_key, rest_item, _ in joined if rest_item is not None)
+                        e.unfinished = unfinished
+                        raise
+
+        self.stats["dest_orphans"] = orphans
+        if orphans:
+            logger.info(f"{orphans} destination item(s) have no matching source item (left alone)")
+        if unfinished:
+            logger.warning(f"{len(unfinished)} item(s) carried over to the next run")
+        return unfinished
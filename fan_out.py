@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+One-to-many sync: one source board copied into several destination boards
+
+The source board is fetched and its column values are normalized once. Each
+destination then gets its own MondaySync (sharing the HTTP session, rate limiter
+and state store) that only remaps the prepared values to its own column IDs and
+labels, and all destinations are written concurrently with separate stats,
+carry-over and dead-letter state.
+
+SYNC_DESTINATIONS is a JSON list, e.g.
+    [{"board_id": "123", "source_item_id_column": "text_1",
+      "column_mapping": {"status": "status_5"}, "label_aliases": {"status_5": {"New": "Open"}}}]
+"""
+
+import copy
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from link_translation import LINK_TYPES, LinkTranslator
+
+logger = logging.getLogger(__name__)
+
+
+def parse_destinations(text: str) -> List[Dict]:
+    """Parse SYNC_DESTINATIONS; an empty value means a single destination (DEST_BOARD_ID)"""
+    if not text.strip():
+        return []
+    try:
+        destinations = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"SYNC_DESTINATIONS is not valid JSON: {e}") from None
+    if not isinstance(destinations, list) or not all(
+        isinstance(dest, dict) and dest.get("board_id") for dest in destinations
+    ):
+        raise ValueError("SYNC_DESTINATIONS must be a list of objects with at least a 'board_id'")
+    board_ids = [str(dest["board_id"]) for dest in destinations]
+    if len(set(board_ids)) != len(board_ids):
+        raise ValueError("SYNC_DESTINATIONS lists the same board more than once")
+    return destinations
+
+
+def remap_values(values: Dict[str, Any], column_id_mapping: Dict[str, str],
+                 dest_label: Callable[[str, str], str]) -> Dict[str, Any]:
+    """Move values prepared under source column IDs to destination column IDs and labels"""
+    remapped = {}
+    for col_id, value in values.items():
+        dest_col_id = column_id_mapping.get(col_id, col_id)
+        if dest_col_id is None:
+            continue
+        if isinstance(value, dict) and "label" in value:
+            value = {"label": dest_label(dest_col_id, value["label"])}
+        elif isinstance(value, dict) and "labels" in value:
+            value = {"labels": [dest_label(dest_col_id, label) for label in value["labels"]]}
+        remapped[dest_col_id] = value
+    return remapped
+
+
+class FanOutSync:
+    """Syncs one source board into every configured destination board"""
+
+    def __init__(self, syncer, destinations: List[Dict]):
+        self.syncer = syncer
+        # Open the state store once so every destination shares the connection
+        syncer.state
+        self.children = [self._child(dest) for dest in destinations]
+
+    def _child(self, dest: Dict):
+        """MondaySync for one destination, sharing the parent's session, transport and state"""
+        child = copy.copy(self.syncer)
+        child.dest_board_id = str(dest["board_id"])
+        child.source_item_id_column = dest.get("source_item_id_column", self.syncer.source_item_id_column)
+        child.column_id_mapping = dest.get("column_mapping", self.syncer.column_id_mapping)
+        # A destination's own column_mapping overrides its automatic column plan
+        child.column_overrides = dest.get("column_mapping", self.syncer.column_overrides)
+        child.label_aliases = dest.get("label_aliases", self.syncer.label_aliases)
+        # Linked items have different copies on every destination board
+        child.link_translator = LinkTranslator(child, child.linked_boards)
+        # Fetching, exporting and transforming are done once by the parent
+        child.export_dir = ""
+        child.read_snapshot_enabled = False
+        child.pipeline_enabled = False
+        child.external_join = False
+        child.transform_workers = 0
+        return child
+
+    def _prepare(self, source_items: List[Any], columns_info: Dict) -> Dict[str, Dict[str, Any]]:
+        """Normalize every source item once, under source column IDs and labels"""
+        neutral = copy.copy(self.syncer)
+        neutral.label_aliases = {}
+        neutral.link_translator = None
+        prepared = {}
+        for item in source_items:
+            values = neutral.prepare_column_values(item, columns_info, {}, verbose=False)
+            for col_value in item["column_values"]:
+                col_id = col_value["id"]
+                # Links still hold source item IDs here; each destination adds its own translated links
+                if col_value["type"] in LINK_TYPES:
+                    values.pop(col_id, None)
+                # People are mapped through the account directory, the same for every destination
+                elif col_value["type"] == "people" and col_id in values and neutral.people_directory is not None:
+                    people = neutral.people_directory.map_people(values[col_id]["personsAndTeams"])
+                    if people:
+                        values[col_id] = {"personsAndTeams": people}
+                    else:
+                        del values[col_id]
+            prepared[item["id"]] = values
+        return prepared
+
+    def _run_child(self, child) -> Dict[str, int]:
+        try:
+            return child.sync_boards()
+        except Exception as e:
+            logger.error(f"Sync to destination board {child.dest_board_id} failed: {e}")
+            return {"errors": 1, "failed": 1}
+
+    def run(self) -> Dict[str, Dict[str, int]]:
+        """Fetch and transform once, write all destinations concurrently; returns stats per destination board"""
+        syncer = self.syncer
+        columns_info = syncer.get_column_mapping(syncer.source_board_id)
+
+        syncer.exporter = syncer._open_exporter(columns_info)
+        try:
+            source_items = syncer.get_board_items(syncer.source_board_id, query_params=syncer.source_filter,
+                                                  on_page=syncer._export_page)
+        finally:
+            if syncer.exporter is not None:
+                syncer.exporter.close()
+                syncer.exporter = None
+        source_items = [item for item in source_items if syncer._in_shard(item)]
+        if syncer.item_limit:
+            source_items = source_items[:syncer.item_limit]
+
+        prepared = self._prepare(source_items, columns_info)
+        logger.info(f"Fanning out {len(source_items)} source items to {len(self.children)} destination board(s)")
+
+        for child in self.children:
+            child.warm_columns = columns_info
+            child.prefetched_source = source_items
+            child.prepared_values = prepared
+
+        with ThreadPoolExecutor(max_workers=len(self.children), thread_name_prefix="dest") as pool:
+            results = dict(zip(
+                [child.dest_board_id for child in self.children],
+                pool.map(self._run_child, self.children)
+            ))
+
+        for board_id, stats in results.items():
+            logger.info(f"Destination {board_id}: {stats}")
+        return results
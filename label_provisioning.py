@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pre-flight creation of status and dropdown labels missing on the destination board
+
+Status and dropdown values are written as text labels. If the destination column
+doesn't have a label, every write that uses it fails, on every run. Before any
+writes, the labels used by the source items are collected, mapped through the
+alias table (LABEL_ALIASES) and compared with the destination column settings;
+missing ones are added to their columns in a single batched mutation.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+LABEL_COLUMN_TYPES = {"status", "dropdown"}
+
+# Status label index 5 is the column's built-in empty label
+EMPTY_STATUS_INDEX = 5
+# Colors given to new status labels, in order
+STATUS_COLORS = [
+    "working_orange", "done_green", "stuck_red", "dark_blue", "purple",
+    "grass_green", "sky", "peach", "bright_blue", "egg_yolk",
+]
+
+
+def parse_label_aliases(text: str) -> Dict[str, Dict[str, str]]:
+    """Parse LABEL_ALIASES: {"<dest column ID or *>": {"<source label>": "<dest label>"}}"""
+    if not text.strip():
+        return {}
+    try:
+        aliases = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"LABEL_ALIASES is not valid JSON: {e}") from None
+    if not isinstance(aliases, dict) or not all(isinstance(table, dict) for table in aliases.values()):
+        raise ValueError("LABEL_ALIASES must map column IDs (or '*') to {source label: destination label} objects")
+    return aliases
+
+
+def split_labels(text: str) -> List[str]:
+    """Labels of a status/dropdown display text (dropdowns list several, comma-separated)"""
+    return [label.strip() for label in text.split(",") if label.strip()]
+
+
+def existing_labels(col_type: str, settings: Dict) -> List[Dict]:
+    """Labels defined in a column's settings_str, as [{"id", "label"}]"""
+    labels = settings.get("labels") or {}
+    if col_type == "status":
+        return [{"id": int(index), "label": label} for index, label in labels.items() if label]
+    return [{"id": label["id"], "label": label["name"]} for label in labels]
+
+
+class LabelProvisioner:
+    """Finds labels the destination board lacks and creates them before writes start"""
+
+    def __init__(self, syncer):
+        self.syncer = syncer
+        # dest column ID -> {"type", "revision", "labels": [{"id", "label"}]}, fetched on first use
+        self._columns: Optional[Dict[str, Dict]] = None
+        # dest column ID -> labels known to exist (or already attempted)
+        self._known: Dict[str, Set[str]] = {}
+
+    def _load_columns(self) -> None:
+        self._columns = {}
+        for col_id, col in self.syncer.get_column_settings(self.syncer.dest_board_id).items():
+            if col["type"] not in LABEL_COLUMN_TYPES:
+                continue
+            self._columns[col_id] = {
+                "type": col["type"],
+                "revision": col.get("revision"),
+                "labels": existing_labels(col["type"], col["settings"]),
+            }
+            self._known[col_id] = {label["label"] for label in self._columns[col_id]["labels"]}
+
+    def needed_labels(self, items: Iterable[Any]) -> Dict[str, Set[str]]:
+        """Destination labels the given source items will write, per destination column"""
+        needed: Dict[str, Set[str]] = {}
+        for item in items:
+            for col_value in item["column_values"]:
+                if col_value["type"] not in LABEL_COLUMN_TYPES or not col_value["text"]:
+                    continue
+                dest_col_id = self.syncer.column_id_mapping.get(col_value["id"], col_value["id"])
+                if dest_col_id is None:
+                    continue
+                labels = split_labels(col_value["text"]) if col_value["type"] == "dropdown" else [col_value["text"]]
+                needed.setdefault(dest_col_id, set()).update(
+                    self.syncer.dest_label(dest_col_id, label) for label in labels
+                )
+        return needed
+
+    def missing_labels(self, items: Iterable[Any]) -> Dict[str, List[str]]:
+        """Labels the items need that their destination columns don't have yet"""
+        if self._columns is None:
+            self._load_columns()
+        missing = {}
+        for dest_col_id, labels in self.needed_labels(items).items():
+            if dest_col_id not in self._columns:
+                continue
+            new = sorted(labels - self._known[dest_col_id])
+            if new:
+                missing[dest_col_id] = new
+        return missing
+
+    def _settings(self, dest_col_id: str, new_labels: List[str]) -> Dict:
+        """Full label list for a column: its existing labels plus the new ones"""
+        col = self._columns[dest_col_id]
+        labels: List[Dict[str, Any]] = [dict(label) for label in col["labels"]]
+        if col["type"] == "dropdown":
+            labels += [{"label": label} for label in new_labels]
+            return {"labels": labels}
+
+        # A status label's ID is its index
+        for label in labels:
+            label["index"] = label["id"]
+        used = {label["id"] for label in col["labels"]} | {EMPTY_STATUS_INDEX}
+        index = 0
+        for position, label in enumerate(new_labels):
+            while index in used:
+                index += 1
+            used.add(index)
+            labels.append({"label": label, "index": index, "color": STATUS_COLORS[position % len(STATUS_COLORS)]})
+        return {"labels": labels}
+
+    def provision(self, items: Iterable[Any]) -> int:
+        """Create every missing label in one mutation; returns how many labels were created"""
+        missing = self.missing_labels(items)
+        if not missing:
+            return 0
+
+        definitions = []
+        variables: Dict[str, Any] = {"boardId": self.syncer.dest_board_id}
+        fields = []
+        for position, (dest_col_id, labels) in enumerate(missing.items()):
+            col = self._columns[dest_col_id]
+            mutation = "update_status_column" if col["type"] == "status" else "update_dropdown_column"
+            settings_type = "UpdateStatusColumnSettingsInput" if col["type"] == "status" else "UpdateDropdownColumnSettingsInput"
+            definitions.append(f"$col{position}: String!, $rev{position}: String!, $settings{position}: {settings_type}!")
+            fields.append(
+                f"c{position}: {mutation}(board_id: $boardId, id: $col{position}, "
+                f"revision: $rev{position}, settings: $settings{position}) {{ id }}"
+            )
+            variables[f"col{position}"] = dest_col_id
+            variables[f"rev{position}"] = col["revision"]
+            variables[f"settings{position}"] = self._settings(dest_col_id, labels)
+            logger.info(f"Adding {len(labels)} label(s) to destination column '{dest_col_id}': {', '.join(labels)}")
+
+        query = "mutation ($boardId: ID!, %s) {\n    %s\n}" % (", ".join(definitions), "\n    ".join(fields))
+        created = sum(len(labels) for labels in missing.values())
+        try:
+            self.syncer._execute_query(query, variables)
+        except Exception as e:
+            logger.error(f"Could not create missing labels (writes using them will fail): {e}")
+            created = 0
+        else:
+            # Re-read the columns before the next batch so revisions and label IDs are current
+            self._columns = None
+        finally:
+            # Don't retry the same labels for every page of this run
+            for dest_col_id, labels in missing.items():
+                self._known[dest_col_id].update(labels)
+        return created
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Translation of connected-item IDs for board_relation and dependency columns
+
+A link column on the source board points at source-side item IDs, which mean
+nothing on the destination board: the destination copy has to point at the
+destination copies of the linked items. The translator keeps a source item ID ->
+destination item ID index per destination board in the state store, shared by
+every board pair that syncs into it. Before payloads are built, all linked IDs
+of a batch of items that aren't indexed yet are resolved in bulk: from the
+destination index the sync already built (links within the board), and
+otherwise by looking up which board each linked item is on and querying the
+destination copies of that board (LINKED_BOARDS) by their source_item_id column.
+
+Building payloads only reads the index, so there are no per-item lookups. Links
+that can't be resolved yet (e.g. to an item created later in the same run) are
+left out and picked up on a later run.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Column types whose value is a list of linked item IDs
+LINK_TYPES = {"board_relation", "dependency"}
+
+# IDs per items(ids:) lookup and per items_page any_of rule
+LOOKUP_CHUNK_SIZE = 100
+
+
+def parse_linked_boards(text: str) -> Dict[str, Dict[str, str]]:
+    """Parse LINKED_BOARDS: source board ID -> {"board_id", "source_item_id_column"} of its destination copy
+
+    A plain string value is taken as the destination board ID.
+    """
+    if not text.strip():
+        return {}
+    try:
+        boards = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"LINKED_BOARDS is not valid JSON: {e}") from None
+    if not isinstance(boards, dict):
+        raise ValueError("LINKED_BOARDS must map source board IDs to destination boards")
+    return {
+        str(source): {"board_id": str(dest)} if not isinstance(dest, dict) else {k: str(v) for k, v in dest.items()}
+        for source, dest in boards.items()
+    }
+
+
+def linked_ids(value: Any) -> List[str]:
+    """Item IDs in a parsed board_relation/dependency value (read or write format)"""
+    if not isinstance(value, dict):
+        return []
+    if "item_ids" in value:
+        return [str(item_id) for item_id in value["item_ids"] or []]
+    return [str(link["linkedPulseId"]) for link in value.get("linkedPulseIds") or [] if "linkedPulseId" in link]
+
+
+def link_value(item_ids: Iterable[str]) -> Dict[str, List[int]]:
+    """Write format of a link column (sorted, so equal links compare equal)"""
+    return {"item_ids": sorted(int(item_id) for item_id in item_ids)}
+
+
+class LinkTranslator:
+    """Cached source -> destination item ID index for one destination board"""
+
+    def __init__(self, syncer, linked_boards: Optional[Dict[str, Dict[str, str]]] = None):
+        self.syncer = syncer
+        self.linked_boards = dict(linked_boards or {})
+        # Links within the source board point at copies on the destination board
+        self.linked_boards.setdefault(syncer.source_board_id, {
+            "board_id": syncer.dest_board_id, "source_item_id_column": syncer.source_item_id_column
+        })
+        self.namespace = f"linked_ids:{syncer.dest_board_id}"
+        self._known: Optional[Dict[str, str]] = None
+
+    @property
+    def known(self) -> Dict[str, str]:
+        """Source item ID -> destination item ID, loaded from the state store on first use"""
+        if self._known is None:
+            self._known = self.syncer.state.items(self.namespace)
+        return self._known
+
+    def preload(self, known: Dict[str, str]) -> None:
+        """Use this index instead of the state store (worker processes)"""
+        self._known = dict(known)
+
+    def wanted(self, items: Iterable[Any]) -> Set[str]:
+        """Linked item IDs in these items' link columns"""
+        ids: Set[str] = set()
+        for item in items:
+            for col_value in item["column_values"]:
+                if col_value["type"] in LINK_TYPES and col_value["value"]:
+                    raw = col_value["value"]
+                    ids.update(linked_ids(json.loads(raw) if isinstance(raw, str) else raw))
+        return ids
+
+    def subset(self, items: Iterable[Any]) -> Dict[str, str]:
+        """The part of the index these items need"""
+        return {item_id: self.known[item_id] for item_id in self.wanted(items) if item_id in self.known}
+
+    def record(self, mapping: Dict[str, str]) -> None:
+        """Add source -> destination pairs to the index"""
+        new = {source: dest for source, dest in mapping.items() if self.known.get(source) != dest}
+        if new:
+            self.known.update(new)
+            self.syncer.state.put_many(self.namespace, new)
+
+    def _boards_of(self, item_ids: List[str]) -> Dict[str, List[str]]:
+        """Source board ID -> the given item IDs on it"""
+        query = """
+        query ($itemIds: [ID!]) {
+            items(ids: $itemIds) {
+                id
+                board {
+                    id
+                }
+            }
+        }
+        """
+        boards: Dict[str, List[str]] = {}
+        for start in range(0, len(item_ids), LOOKUP_CHUNK_SIZE):
+            result = self.syncer._execute_query(query, {"itemIds": item_ids[start:start + LOOKUP_CHUNK_SIZE]})
+            for item in result.get("data", {}).get("items") or []:
+                boards.setdefault(str(item["board"]["id"]), []).append(str(item["id"]))
+        return boards
+
+    def _find_copies(self, dest: Dict[str, str], item_ids: List[str]) -> Dict[str, str]:
+        """Destination copies of these source items on one destination board, by their source_item_id column"""
+        id_column = dest.get("source_item_id_column", self.syncer.source_item_id_column)
+        found = {}
+        for start in range(0, len(item_ids), LOOKUP_CHUNK_SIZE):
+            chunk = item_ids[start:start + LOOKUP_CHUNK_SIZE]
+            query_params = {"rules": [{"column_id": id_column, "compare_value": chunk, "operator": "any_of"}]}
+            for page in self.syncer.iter_board_item_pages(dest["board_id"], query_params=query_params):
+                for item in page:
+                    for col_value in item["column_values"]:
+                        if col_value["id"] == id_column and col_value["text"] in chunk:
+                            found.setdefault(col_value["text"], item["id"])
+        return found
+
+    def copies(self, item_ids: Set[str], dest_lookup: Optional[Dict[str, Any]] = None,
+               board_id: Optional[str] = None) -> Dict[str, str]:
+        """Destination copies of these source items; IDs not indexed yet are resolved in bulk
+
+        board_id skips looking up which board the items are on when all are on that board.
+        Items without a copy are left out.
+        """
+        missing = set(item_ids) - self.known.keys()
+        if missing:
+            found: Dict[str, str] = {}
+            if dest_lookup:
+                found.update({item_id: dest_lookup[item_id]["id"] for item_id in missing if item_id in dest_lookup})
+                missing -= found.keys()
+            if missing:
+                boards = {board_id: sorted(missing)} if board_id else self._boards_of(sorted(missing))
+                for source_board, ids in boards.items():
+                    dest = self.linked_boards.get(source_board)
+                    if dest is None:
+                        logger.warning(f"{len(ids)} linked item(s) are on board {source_board}, which has no "
+                                       f"destination board in LINKED_BOARDS; those links are not synced")
+                        continue
+                    found.update(self._find_copies(dest, ids))
+                missing -= found.keys()
+            self.record(found)
+            logger.info(f"Resolved {len(found)} item ID(s); {len(missing)} without a destination copy yet")
+        return {item_id: self.known[item_id] for item_id in item_ids if item_id in self.known}
+
+    def resolve(self, items: Iterable[Any], dest_lookup: Optional[Dict[str, Any]] = None) -> int:
+        """Index the destination counterparts of all not yet known linked IDs; returns how many are still unknown"""
+        wanted = self.wanted(items)
+        return len(wanted) - len(self.copies(wanted, dest_lookup))
+
+    def translate(self, value: Any) -> Optional[Dict[str, List[int]]]:
+        """Link value pointing at destination items, or None if none of the links can be translated yet"""
+        ids = linked_ids(value)
+        translated = [self.known[item_id] for item_id in ids if item_id in self.known]
+        if len(translated) < len(ids):
+            logger.debug(f"{len(ids) - len(translated)} link(s) not translated yet: "
+                         f"{[item_id for item_id in ids if item_id not in self.known]}")
+        return link_value(translated) if translated else None
@@ -5,13 +5,48 @@ Syncs data from Main Board to Duplicate Board daily
 """
 
 import os
+import sys
 import json
+import threading
+import time
+import hashlib
+import argparse
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
+from contextlib import nullcontext
 from datetime import datetime
 from dotenv import load_dotenv
 
+from backfill import DEFAULT_BATCH_SIZE as BACKFILL_BATCH_SIZE, run_backfill
+from bidirectional import CONFLICT_POLICIES, run_bidirectional
+from board_export import BoardExporter
+from board_model import BoardSchema, CompactItem, column_text
+from daemon import run_daemon
+from dead_letter import CircuitBreaker, CircuitOpenError, DeadLetterQueue, is_auth_error
+from diagnostics import add_diagnostic_commands
+from directory import PeopleDirectory, parse_people_map
+from external_join import DEFAULT_RUN_ITEMS, ExternalJoinSync
+from fan_out import FanOutSync, parse_destinations, remap_values
+from label_provisioning import LabelProvisioner, parse_label_aliases, split_labels
+from link_translation import LINK_TYPES, LinkTranslator, link_value, linked_ids, parse_linked_boards
+from rate_limiter import RateLimiter
+from read_api import SnapshotWriter, run_serve
+from repair import DEFAULT_BATCH_SIZE, run_repair
+from run_lease import RunLease
+from schema_match import SchemaMatcher, parse_column_map, run_match_columns
+from sharding import merge_metrics, metrics_path, parse_shard, shard_of, write_metrics
+from state_store import StateStore
+from sync_pipeline import SyncPipeline
+from transform_pool import TransformPool
+from transport import HttpTransport, RecordingTransport, ReplayTransport
+from updates_sync import DEFAULT_BATCH_SIZE as UPDATES_BATCH_SIZE, UpdatesSync, run_updates
+from verify import BoardVerifier
+from work_scheduler import (
+    WorkItem, WorkScheduler,
+    PRIORITY_NEW, PRIORITY_STATUS_CHANGED, PRIORITY_OTHER,
+)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -26,11 +61,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column types whose destination value is built from the display text alone
+TEXT_VALUE_TYPES = {"text", "status", "numeric", "numbers", "dropdown", "long-text"}
+
+# Subcommands that write to the boards and so take the run lease like a sync
+LEASED_COMMANDS = {"backfill", "bidirectional", "daemon", "repair", "updates"}
+
+# Subcommands that map columns without going through sync_boards, so they apply the column plan up front
+PLANNED_COMMANDS = {"backfill", "bidirectional", "repair", "verify"}
+
+
+def parse_items_filter(text: str) -> Optional[Dict]:
+    """Parse an items_page query_params filter from JSON
+    
+    Accepts either a full query_params object ({"rules": [...], "operator": "and"})
+    or just the list of rules, e.g.
+    [{"column_id": "status", "compare_value": [1], "operator": "any_of"}]
+    """
+    if not text.strip():
+        return None
+    try:
+        query_params = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid items filter JSON: {e}")
+    if isinstance(query_params, list):
+        query_params = {"rules": query_params}
+    
+    rules = query_params.get("rules") if isinstance(query_params, dict) else None
+    if not rules or not all(isinstance(rule, dict) and "column_id" in rule and "compare_value" in rule for rule in rules):
+        raise ValueError("Items filter needs a non-empty list of rules, each with column_id and compare_value")
+    return query_params
+
 
 class MondaySync:
     """Handles syncing between two Monday.com boards"""
     
-    def __init__(self, api_token: str, source_board_id: str, dest_board_id: str, source_item_id_column: str = "YOUR_SOURCE_ITEM_ID_COLUMN"):
+    def __init__(self, api_token: str, source_board_id: str, dest_board_id: str, source_item_id_column: str = "YOUR_SOURCE_ITEM_ID_COLUMN",
+                 state_store: Optional[StateStore] = None, shard: Optional[Tuple[int, int]] = None):
         self.api_token = api_token
         self.source_board_id = source_board_id
         self.dest_board_id = dest_board_id
@@ -41,6 +108,17 @@ class MondaySync:
             "Content-Type": "application/json"
         }
         
+        # One pooled HTTP session and rate limiter for every request made through this client
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.rate_limiter = RateLimiter(int(os.getenv("MONDAY_MAX_REQUESTS_PER_MINUTE", "0")))
+        
+        # Every query goes through the transport, which can be swapped for record/replay
+        self.transport = HttpTransport(self.api_url, self.session, self.rate_limiter)
+        
+        # On-disk cache of board schemas and items for the diagnostics commands
+        self.cache_ttl_seconds = float(os.getenv("MONDAY_CACHE_TTL_SECONDS", "900"))
+        
         # Column ID mapping: source_column_id -> dest_column_id
         # This maps columns from source board to destination board when IDs differ
         # Set these via environment variables: SRC_COMPLETION_COL, DEST_COMPLETION_COL, etc.
@@ -52,6 +130,163 @@ class MondaySync:
             os.getenv("SRC_FILE_COL", "YOUR_SRC_FILE_COL"): os.getenv("DEST_FILE_COL", "YOUR_DEST_FILE_COL"),
         }
         
+        # Match the remaining columns by ID, then title and type (schema_match); the pairs
+        # configured above and COLUMN_MAP ({"src": "dest"}, null = don't sync) take precedence
+        self.auto_match_columns = os.getenv("SYNC_AUTO_MATCH_COLUMNS", "0") == "1"
+        self.column_overrides = {
+            src: dest for src, dest in self.column_id_mapping.items()
+            if not src.startswith("YOUR_") and not dest.startswith("YOUR_")
+        }
+        self.column_overrides.update(parse_column_map(os.getenv("COLUMN_MAP", "")))
+        self.column_plan: Optional[Dict[str, Dict]] = None
+        
+        # Destination label to write for a source status/dropdown label, per dest column ("*" = any column)
+        self.label_aliases = parse_label_aliases(os.getenv("LABEL_ALIASES", ""))
+        # Create status/dropdown labels missing on the destination board before writing
+        self.provision_labels = os.getenv("SYNC_PROVISION_LABELS", "0") == "1"
+        self.label_provisioner: Optional[LabelProvisioner] = None
+        
+        # Connected items (board_relation/dependency) are linked to their destination copies
+        # LINKED_BOARDS names the destination copy of every other source board links point to
+        self.linked_boards = parse_linked_boards(os.getenv("LINKED_BOARDS", ""))
+        self.link_translator: Optional[LinkTranslator] = LinkTranslator(self, self.linked_boards)
+        
+        # People columns mapped through the account's user/team directory (deactivated users, PEOPLE_MAP)
+        people_map = parse_people_map(os.getenv("PEOPLE_MAP", ""))
+        self.people_directory: Optional[PeopleDirectory] = None
+        if people_map or os.getenv("PEOPLE_DIRECTORY", "0") == "1":
+            self.people_directory = PeopleDirectory(
+                self, people_map, fallback=os.getenv("PEOPLE_FALLBACK", ""),
+                ttl_seconds=float(os.getenv("PEOPLE_DIRECTORY_TTL_SECONDS", "86400"))
+            )
+        
+        # Failed items are retried with exponential backoff instead of on every run
+        self.dead_letter_enabled = os.getenv("SYNC_DEAD_LETTER", "1") == "1"
+        self.dead_letter_base_seconds = float(os.getenv("SYNC_DEAD_LETTER_BASE_SECONDS", "3600"))
+        self.dead_letter_max_seconds = float(os.getenv("SYNC_DEAD_LETTER_MAX_SECONDS", str(7 * 86400)))
+        self.dead_letters: Optional[DeadLetterQueue] = None
+        
+        # Abort the run when this share of the last SYNC_BREAKER_WINDOW writes failed (0 = never)
+        self.breaker_error_rate = float(os.getenv("SYNC_BREAKER_ERROR_RATE", "0.5"))
+        self.breaker_window = int(os.getenv("SYNC_BREAKER_WINDOW", "20"))
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        
+        # Persistent state (carry-over work etc.) - opened lazily so read-only tools don't create it
+        self._state = state_store
+        
+        # Write scheduling: stop before the runner deadline or the complexity budget runs out
+        deadline = os.getenv("SYNC_DEADLINE_SECONDS")
+        self.deadline_seconds = float(deadline) if deadline else None
+        self.complexity_reserve = int(os.getenv("SYNC_COMPLEXITY_RESERVE", "50000"))
+        
+        # Last complexity budget reported by the API (updated on every query that asks for it)
+        self.complexity_remaining: Optional[int] = None
+        self.complexity_reset_in: Optional[float] = None
+        
+        # Server-side filter for which source items take part in the sync (items_page query_params)
+        self.source_filter = parse_items_filter(os.getenv("SOURCE_ITEMS_FILTER", ""))
+        
+        # (index, count) when this runner only syncs one slice of the source board
+        self.shard = shard
+        
+        # Hold fetched items as CompactItems instead of raw API dicts (for very large boards)
+        self.compact_items = os.getenv("SYNC_COMPACT_ITEMS", "0") == "1"
+        
+        # Worker processes for the transform stage (0 = transform in this process)
+        self.transform_workers = int(os.getenv("SYNC_TRANSFORM_WORKERS", "0"))
+        chunk_size = os.getenv("SYNC_TRANSFORM_CHUNK_SIZE")
+        self.transform_chunk_size = int(chunk_size) if chunk_size else None
+        
+        # Streaming CSV/Parquet export of fetched source items (off unless SYNC_EXPORT_DIR is set)
+        self.export_dir = os.getenv("SYNC_EXPORT_DIR", "")
+        self.export_format = os.getenv("SYNC_EXPORT_FORMAT", "csv")
+        self.export_mode = os.getenv("SYNC_EXPORT_MODE", "append")
+        self.exporter: Optional[BoardExporter] = None
+        
+        # Snapshot of synced items for the local read API (`serve` subcommand)
+        self.read_snapshot_enabled = os.getenv("SYNC_READ_SNAPSHOT", "0") == "1"
+        self.snapshot: Optional[SnapshotWriter] = None
+        
+        # Kept warm between cycles by the daemon (None = fetch fresh every run)
+        self.warm_columns: Optional[Dict[str, Dict]] = None
+        self.warm_dest_lookup: Optional[Dict[str, Any]] = None
+        # source_id -> fingerprint of the payload last written; unchanged items are skipped
+        self.written_fingerprints: Optional[Dict[str, str]] = None
+        
+        # Set by FanOutSync: source items fetched, and their values prepared, once for all destinations
+        self.prefetched_source: Optional[List[Any]] = None
+        self.prepared_values: Optional[Dict[str, Dict[str, Any]]] = None
+        
+        # Set while a run lease is held; writes stop once it is set (the lease was taken over)
+        self.lease_lost: Optional[threading.Event] = None
+        
+        # Set by --profile (profiling.SyncProfiler)
+        self.profiler = None
+        
+        # Only sync the first N source items (for testing; 0 = all)
+        self.item_limit = 0
+        
+        # Overlap fetching, transforming and writing instead of running them one after another
+        self.pipeline_enabled = os.getenv("SYNC_PIPELINE", "0") == "1"
+        self.pipeline_queue_pages = int(os.getenv("SYNC_PIPELINE_QUEUE_PAGES", "4"))
+        self.pipeline_queue_items = int(os.getenv("SYNC_PIPELINE_QUEUE_ITEMS", "1000"))
+        
+        # Copy new item updates (comments) after writing items; UPDATES_SINCE limits the first run
+        self.updates_enabled = os.getenv("SYNC_UPDATES", "0") == "1"
+        self.updates_since = os.getenv("UPDATES_SINCE") or None
+        
+        # Join the boards through sorted on-disk runs instead of in-memory lists (for boards that don't fit)
+        self.external_join = os.getenv("SYNC_EXTERNAL_JOIN", "0") == "1"
+        self.external_run_items = int(os.getenv("SYNC_EXTERNAL_RUN_ITEMS", str(DEFAULT_RUN_ITEMS)))
+        self.external_join_dir = os.getenv("SYNC_EXTERNAL_JOIN_DIR") or None
+    
+    def use_cassette(self, mode: str, path: str, loose: bool = False) -> None:
+        """Record API exchanges to, or replay them from, a cassette file
+        
+        loose lets replay answer requests whose variables changed with a response recorded for the same query.
+        """
+        if mode == "record":
+            self.transport = RecordingTransport(
+                HttpTransport(self.api_url, self.session, self.rate_limiter), path, secrets=[self.api_token]
+            )
+        elif mode == "replay":
+            self.transport = ReplayTransport(path, loose=loose)
+        else:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected 'record' or 'replay'")
+    
+    @property
+    def state(self) -> StateStore:
+        """Persistent state store, opened on first use"""
+        if self._state is None:
+            self._state = StateStore(os.getenv("SYNC_STATE_PATH", "sync_state.db"))
+        return self._state
+    
+    def apply_column_plan(self, columns_info: Optional[Dict[str, Dict]] = None) -> None:
+        """Use the automatic column plan as the source -> destination mapping"""
+        self.column_plan = SchemaMatcher(self).plan(columns_info)
+        # Unmatched source columns map to None and are left out of payloads
+        self.column_id_mapping = self.column_plan["mapping"]
+    
+    def dead_letter_queue(self) -> DeadLetterQueue:
+        """Dead-letter queue for this board pair"""
+        return DeadLetterQueue(
+            self.state, self._pair_key(),
+            base_delay=self.dead_letter_base_seconds, max_delay=self.dead_letter_max_seconds
+        )
+    
+    def _phase(self, name: str):
+        """Profiling context for one phase of a run (a no-op unless --profile is on)"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+    
+    def _pair_key(self) -> str:
+        """Key identifying this source/destination board pair (and shard) in the state store"""
+        key = f"{self.source_board_id}:{self.dest_board_id}"
+        if self.shard:
+            key += f"#shard-{self.shard[0]}-of-{self.shard[1]}"
+        return key
+        
     def _execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute a GraphQL query against Monday.com API"""
         data = {"query": query}
@@ -59,25 +294,33 @@ class MondaySync:
             data["variables"] = variables
             
         try:
-            response = requests.post(self.api_url, json=data, headers=self.headers)
-            response.raise_for_status()
-            result = response.json()
+            result = self.transport.post(data)
             
             if "errors" in result:
                 logger.error(f"API errors: {result['errors']}")
                 raise Exception(f"Monday.com API error: {result['errors']}")
+            
+            # Track the remaining complexity budget for queries that request it
+            complexity = (result.get("data") or {}).get("complexity")
+            if complexity:
+                self.complexity_remaining = complexity.get("after")
+                self.complexity_reset_in = complexity.get("reset_in_x_seconds")
                 
             return result
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {e}")
             raise
     
-    def get_board_items(self, board_id: str) -> List[Dict]:
-        """Fetch all items from a board with their column values"""
-        query = """
-        query ($boardId: [ID!]) {
-            boards(ids: $boardId) {
-                items_page(limit: 500) {
+    def iter_board_item_pages(self, board_id: str, page_size: int = 500,
+                              query_params: Optional[Dict] = None,
+                              group_id: Optional[str] = None) -> Iterator[List[Dict]]:
+        """Yield a board's items one page at a time, following the items_page cursor
+        
+        query_params (items_page rules/operator) is applied by Monday.com, so only
+        matching items are transferred; the cursor keeps the filter for later pages.
+        With group_id only that group's items are read (each group has its own cursor).
+        """
+        item_fields = """
                     cursor
                     items {
                         id
@@ -89,18 +332,78 @@ class MondaySync:
                             type
                         }
                     }
-                }
+        """
+        definitions = "$boardId: [ID!], $limit: Int!"
+        items_page = "items_page(limit: $limit) {%s}" % item_fields
+        if query_params:
+            definitions += ", $queryParams: ItemsQuery"
+            items_page = "items_page(limit: $limit, query_params: $queryParams) {%s}" % item_fields
+        if group_id:
+            definitions += ", $groupId: [String]"
+            items_page = "groups(ids: $groupId) { %s }" % items_page
+        first_query = """
+        query (%s) {
+            complexity {
+                after
+                reset_in_x_seconds
+            }
+            boards(ids: $boardId) {
+                %s
             }
         }
-        """
+        """ % (definitions, items_page)
+        next_query = """
+        query ($cursor: String!, $limit: Int!) {
+            complexity {
+                after
+                reset_in_x_seconds
+            }
+            next_items_page(limit: $limit, cursor: $cursor) {%s}
+        }
+        """ % item_fields
         
-        variables = {"boardId": board_id}
-        result = self._execute_query(query, variables)
+        variables = {"boardId": board_id, "limit": page_size}
+        if query_params:
+            variables["queryParams"] = query_params
+        if group_id:
+            variables["groupId"] = [group_id]
+        result = self._execute_query(first_query, variables)
+        if not result.get("data", {}).get("boards"):
+            return
+        board = result["data"]["boards"][0]
+        if group_id:
+            if not board.get("groups"):
+                return
+            board = board["groups"][0]
+        page = board["items_page"]
+        
+        while True:
+            yield page["items"]
+            if not page.get("cursor"):
+                break
+            result = self._execute_query(next_query, {"cursor": page["cursor"], "limit": page_size})
+            page = result["data"]["next_items_page"]
+    
+    def get_board_items(self, board_id: str, compact: Optional[bool] = None,
+                        query_params: Optional[Dict] = None,
+                        on_page: Optional[Callable[[List[Any]], None]] = None) -> List[Any]:
+        """Fetch all items from a board with their column values
+        
+        With compact=True (default: SYNC_COMPACT_ITEMS) each page is converted to
+        CompactItems as it arrives, so only one page of raw API dicts is held at a time.
+        on_page is called with each page's items as soon as the page arrives.
+        """
+        if compact is None:
+            compact = self.compact_items
+        schema = BoardSchema() if compact else None
         
         items = []
-        if result.get("data", {}).get("boards"):
-            board_data = result["data"]["boards"][0]
-            items = board_data["items_page"]["items"]
+        for page in self.iter_board_item_pages(board_id, query_params=query_params):
+            if schema is not None:
+                page = [schema.compact(item) for item in page]
+            if on_page is not None:
+                on_page(page)
+            items.extend(page)
             
         logger.info(f"Retrieved {len(items)} items from board {board_id}")
         return items
@@ -133,10 +436,105 @@ class MondaySync:
         logger.info(f"Retrieved {len(columns)} columns from board {board_id}")
         return columns
     
-    def create_item(self, board_id: str, item_name: str, column_values: Dict[str, Any]) -> str:
+    def get_column_settings(self, board_id: str) -> Dict[str, Dict]:
+        """Get column definitions including their parsed settings (labels etc.) and revision"""
+        query = """
+        query ($boardId: [ID!]) {
+            boards(ids: $boardId) {
+                columns {
+                    id
+                    title
+                    type
+                    settings_str
+                    revision
+                }
+            }
+        }
+        """
+        
+        result = self._execute_query(query, {"boardId": board_id})
+        columns = {}
+        if result.get("data", {}).get("boards"):
+            for col in result["data"]["boards"][0]["columns"]:
+                columns[col["id"]] = {
+                    "title": col["title"],
+                    "type": col["type"],
+                    "settings": json.loads(col.get("settings_str") or "{}"),
+                    "revision": col.get("revision"),
+                }
+        return columns
+    
+    def get_items(self, item_ids: List[str]) -> List[Dict]:
+        """Fetch specific items (from any board) with their board and column values"""
+        query = """
+        query ($itemIds: [ID!]) {
+            items(ids: $itemIds) {
+                id
+                name
+                board {
+                    id
+                    name
+                }
+                column_values {
+                    id
+                    text
+                    value
+                    type
+                }
+            }
+        }
+        """
+        
+        result = self._execute_query(query, {"itemIds": item_ids})
+        return result.get("data", {}).get("items") or []
+    
+    def list_boards(self, limit: int = 50) -> List[Dict]:
+        """List boards the API token has access to"""
+        query = """
+        query ($limit: Int!) {
+            boards(limit: $limit) {
+                id
+                name
+            }
+        }
+        """
+        
+        result = self._execute_query(query, {"limit": limit})
+        return result.get("data", {}).get("boards") or []
+    
+    def get_column_mapping_cached(self, board_id: str, refresh: bool = False) -> Dict[str, Dict]:
+        """get_column_mapping, served from the on-disk cache while it is fresh"""
+        if not refresh:
+            columns = self.state.get("schema_cache", str(board_id), max_age=self.cache_ttl_seconds)
+            if columns is not None:
+                logger.info(f"Using cached columns for board {board_id}")
+                return columns
+        columns = self.get_column_mapping(board_id)
+        self.state.put("schema_cache", str(board_id), columns)
+        return columns
+    
+    def get_board_items_cached(self, board_id: str, refresh: bool = False) -> List[Dict]:
+        """get_board_items, served from the on-disk cache while it is fresh"""
+        if not refresh:
+            items = self.state.get("item_cache", str(board_id), max_age=self.cache_ttl_seconds)
+            if items is not None:
+                logger.info(f"Using {len(items)} cached items for board {board_id}")
+                return items
+        items = [
+            item.to_dict() if isinstance(item, CompactItem) else item
+            for item in self.get_board_items(board_id)
+        ]
+        self.state.put("item_cache", str(board_id), items)
+        return items
+    
+    def create_item(self, board_id: str, item_name: str, column_values: Union[Dict[str, Any], str]) -> str:
         """Create a new item in a board"""
         query = """
         mutation ($boardId: ID!, $itemName: String!, $columnValues: JSON!) {
+            complexity {
+                after
+                reset_in_x_seconds
+            }
             create_item(
                 board_id: $boardId,
                 item_name: $itemName,
@@ -147,8 +545,8 @@ class MondaySync:
         }
         """
         
-        # Convert column values to JSON string format
-        column_values_json = json.dumps(column_values)
+        # Convert column values to JSON string format (unless already serialized)
+        column_values_json = column_values if isinstance(column_values, str) else json.dumps(column_values)
         
         variables = {
             "boardId": board_id,
@@ -161,10 +559,14 @@ class MondaySync:
         logger.info(f"Created new item: {item_name} (ID: {item_id})")
         return item_id
     
-    def update_item(self, board_id: str, item_id: str, column_values: Dict[str, Any]) -> None:
+    def update_item(self, board_id: str, item_id: str, column_values: Union[Dict[str, Any], str]) -> None:
         """Update an existing item's column values"""
         query = """
         mutation ($boardId: ID!, $itemId: ID!, $columnValues: JSON!) {
+            complexity {
+                after
+                reset_in_x_seconds
+            }
             change_multiple_column_values(
                 board_id: $boardId,
                 item_id: $itemId,
@@ -175,8 +577,8 @@ class MondaySync:
         }
         """
         
-        # Convert column values to JSON string format
-        column_values_json = json.dumps(column_values)
+        # Convert column values to JSON string format (unless already serialized)
+        column_values_json = column_values if isinstance(column_values, str) else json.dumps(column_values)
         
         variables = {
             "boardId": board_id,
@@ -187,8 +589,17 @@ class MondaySync:
         self._execute_query(query, variables)
         logger.info(f"Updated item ID: {item_id}")
     
-    def prepare_column_values(self, item: Dict, columns_info: Dict) -> Dict[str, Any]:
-        """Convert item column values to the format needed for create/update"""
+    def prepare_column_values(self, item: Dict, columns_info: Dict, column_id_mapping: Optional[Dict[str, str]] = None,
+                              verbose: bool = True) -> Dict[str, Any]:
+        """Convert item column values to the format needed for create/update
+        
+        column_id_mapping defaults to the configured source -> destination mapping;
+        pass {} to normalize an item in place (e.g. a destination item for comparison).
+        Linked item and people IDs are only translated for the destination under the configured mapping.
+        """
+        for_destination = column_id_mapping is None or column_id_mapping is self.column_id_mapping
+        if column_id_mapping is None:
+            column_id_mapping = self.column_id_mapping
         column_values = {}
         
         for col_value in item["column_values"]:
@@ -200,21 +611,27 @@ class MondaySync:
             if not raw_value or raw_value == "null":
                 continue
             
-            # Skip auto-calculated columns that can't be synced
-            if col_type in ["formula", "auto_number", "item_id"]:
+            # Skip auto-calculated and read-only (mirrored) columns that can't be synced
+            if col_type in ["formula", "auto_number", "item_id", "mirror", "lookup"]:
                 continue
             
             try:
-                # Parse the JSON value
-                parsed_value = json.loads(raw_value) if isinstance(raw_value, str) else raw_value
+                # Parse the JSON value (only for types that use it; the rest are synced from text)
+                if col_type in TEXT_VALUE_TYPES:
+                    parsed_value = None
+                else:
+                    parsed_value = json.loads(raw_value) if isinstance(raw_value, str) else raw_value
                 
                 # Map source column ID to destination column ID if mapping exists
-                dest_col_id = self.column_id_mapping.get(col_id, col_id)
+                dest_col_id = column_id_mapping.get(col_id, col_id)
+                if dest_col_id is None:
+                    # No destination column for it in the column plan
+                    continue
                 
                 # DEBUG: Log completion_status and all status columns
-                if col_id == self.src_completion_col or col_type == "status":
+                if verbose and (col_id == self.src_completion_col or col_type == "status"):
                     logger.info(f"  Column '{col_id}' ({col_type}): text='{col_value['text']}', value={raw_value}")
-                    if col_id in self.column_id_mapping:
+                    if col_id in column_id_mapping:
                         logger.info(f"  >> MAPPED to destination column: '{dest_col_id}'")
                 
                 # Handle different column types
@@ -234,16 +651,20 @@ class MondaySync:
                 elif col_type == "status":
                     # Use the text field as the label (this is what Zapier does)
                     if col_value["text"]:
-                        column_values[dest_col_id] = {"label": col_value["text"]}
+                        column_values[dest_col_id] = {"label": self.dest_label(dest_col_id, col_value["text"])}
                         # DEBUG: Log what we're sending for completion status
-                        if col_id == self.src_completion_col:
+                        if verbose and col_id == self.src_completion_col:
                             logger.info(f"  >> SENDING COMPLETION STATUS to column '{dest_col_id}': {column_values[dest_col_id]}")
                 elif col_type == "date":
                     if parsed_value and "date" in parsed_value:
                         column_values[dest_col_id] = {"date": parsed_value["date"]}
                 elif col_type == "people":
                     if parsed_value and "personsAndTeams" in parsed_value:
-                        column_values[dest_col_id] = {"personsAndTeams": parsed_value["personsAndTeams"]}
+                        people = parsed_value["personsAndTeams"]
+                        if for_destination and self.people_directory is not None:
+                            people = self.people_directory.map_people(people)
+                        if people:
+                            column_values[dest_col_id] = {"personsAndTeams": people}
                 elif col_type == "numeric" or col_type == "numbers":
                     if col_value["text"]:
                         column_values[dest_col_id] = col_value["text"]
@@ -260,7 +681,7 @@ class MondaySync:
                     # For dropdowns, use labels like Zapier does (more reliable than IDs)
                     if col_value["text"]:
                         # Split by comma if multiple selections
-                        labels = [label.strip() for label in col_value["text"].split(",")]
+                        labels = [self.dest_label(dest_col_id, label) for label in split_labels(col_value["text"])]
                         if len(labels) == 1:
                             # Single select dropdown
                             column_values[dest_col_id] = {"labels": [labels[0]]}
@@ -280,7 +701,16 @@ class MondaySync:
                     # File columns need special handling - pass the files array
                     if parsed_value and "files" in parsed_value:
                         column_values[dest_col_id] = {"files": parsed_value["files"]}
-                        logger.info(f"  >> FILE COLUMN '{col_id}' -> '{dest_col_id}': {len(parsed_value['files'])} file(s)")
+                        if verbose:
+                            logger.info(f"  >> FILE COLUMN '{col_id}' -> '{dest_col_id}': {len(parsed_value['files'])} file(s)")
+                elif col_type in LINK_TYPES:
+                    # Linked items must point at their destination copies, never at source items
+                    if not for_destination:
+                        column_values[dest_col_id] = link_value(linked_ids(parsed_value))
+                    elif self.link_translator is not None:
+                        translated = self.link_translator.translate(parsed_value)
+                        if translated is not None:
+                            column_values[dest_col_id] = translated
                 else:
                     # For other types, try to use the raw value
                     if col_value["text"]:
@@ -292,116 +722,583 @@ class MondaySync:
         
         return column_values
     
+    def dest_label(self, dest_col_id: str, label: str) -> str:
+        """Destination label for a source status/dropdown label, after LABEL_ALIASES"""
+        for table in (self.label_aliases.get(dest_col_id), self.label_aliases.get("*")):
+            if table and label in table:
+                return table[label]
+        return label
+    
+    def _provision_labels(self, items: List[Any], stats: Dict[str, int]) -> None:
+        """Create labels these items need before any of them are written"""
+        if self.label_provisioner is not None:
+            stats["labels_created"] += self.label_provisioner.provision(items)
+    
+    def build_payload(self, item: Any, columns_info: Dict) -> Tuple[str, str]:
+        """Column values JSON ready to send for a source item, plus a fingerprint of it"""
+        if self.prepared_values is not None and item["id"] in self.prepared_values:
+            column_values = remap_values(self.prepared_values[item["id"]], self.column_id_mapping, self.dest_label)
+            # Links are prepared without translation; each destination has its own copies
+            column_values.update(self._link_values(item))
+        else:
+            column_values = self.prepare_column_values(item, columns_info)
+        
+        # Add the source_item_id to track the relationship
+        column_values[self.source_item_id_column] = item["id"]
+        
+        payload = json.dumps(column_values, sort_keys=True)
+        return payload, hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def _link_values(self, item: Any) -> Dict[str, Any]:
+        """Translated link column values of a source item, keyed by destination column ID"""
+        values = {}
+        if self.link_translator is None:
+            return values
+        for col_value in item["column_values"]:
+            if col_value["type"] in LINK_TYPES and col_value["value"]:
+                raw = col_value["value"]
+                translated = self.link_translator.translate(json.loads(raw) if isinstance(raw, str) else raw)
+                dest_col_id = self.column_id_mapping.get(col_value["id"], col_value["id"])
+                if translated is not None and dest_col_id is not None:
+                    values[dest_col_id] = translated
+        return values
+    
+    def _resolve_links(self, items: List[Any], dest_lookup: Optional[Dict[str, Any]] = None) -> None:
+        """Look up destination IDs for all items linked from these items in one go"""
+        if self.link_translator is not None:
+            self.link_translator.resolve(items, dest_lookup)
+    
+    def _pretransform(self, work: List[WorkItem], columns_info: Dict) -> None:
+        """Build all payloads up front in worker processes"""
+        pool = TransformPool(self, self.transform_workers, self.transform_chunk_size)
+        results = pool.transform([job.source_item for job in work])
+        for job in work:
+            job.payload, job.fingerprint, job.transform_error = results[job.source_id]
+    
+    def _status_changed(self, source_item: Dict, dest_item: Dict) -> bool:
+        """Check whether any status column differs between a source item and its destination copy"""
+        for col_value in source_item["column_values"]:
+            if col_value["type"] != "status":
+                continue
+            dest_col_id = self.column_id_mapping.get(col_value["id"], col_value["id"])
+            dest_text = column_text(dest_item, dest_col_id)
+            if dest_text is not None and (col_value["text"] or "") != dest_text:
+                return True
+        return False
+    
+    def lease_is_lost(self) -> bool:
+        """Whether the run lease was taken over by another process (writes must stop)"""
+        return self.lease_lost is not None and self.lease_lost.is_set()
+    
+    def _in_shard(self, item: Any) -> bool:
+        """Whether a source item belongs to this runner's shard"""
+        if not self.shard:
+            return True
+        index, count = self.shard
+        return shard_of(item["id"], count) == index
+    
+    def _export_page(self, page: List[Any]) -> None:
+        """Stream a page of fetched source items to the BI export, if one is configured"""
+        if self.exporter is not None:
+            self.exporter.write_page([item for item in page if self._in_shard(item)])
+    
+    def _open_exporter(self, columns_info: Dict) -> Optional[BoardExporter]:
+        """Start this run's export file when SYNC_EXPORT_DIR is set"""
+        if not self.export_dir:
+            return None
+        suffix = f"-shard-{self.shard[0]}-of-{self.shard[1]}" if self.shard else ""
+        exporter = BoardExporter(
+            self.export_dir, self.source_board_id, columns_info,
+            fmt=self.export_format, mode=self.export_mode, file_suffix=suffix
+        )
+        logger.info(f"Exporting source items to {exporter.path}")
+        return exporter
+    
+    def _index_dest_items(self, dest_items: List[Any], dest_lookup: Dict[str, Any]) -> None:
+        """Add destination items to a lookup map keyed by source_item_id
+        
+        When several items share a source_item_id the oldest one (lowest ID) is used,
+        the same one `repair` keeps.
+        """
+        for item in dest_items:
+            source_id = column_text(item, self.source_item_id_column)
+            if not source_id:
+                continue
+            existing = dest_lookup.get(source_id)
+            if existing is not None:
+                logger.warning(f"Duplicate destination items for source_id={source_id}: {existing['id']} and {item['id']} "
+                               f"(run `monday_sync.py repair`)")
+                if int(existing["id"]) < int(item["id"]):
+                    continue
+            dest_lookup[source_id] = item
+            logger.debug(f"  Found mapping: source_id={source_id} -> dest_id={item['id']} ({item['name']})")
+    
+    def _carried_over_ids(self) -> set:
+        """Source item IDs left unfinished by the previous run"""
+        return set(self.state.get("carry_over", self._pair_key(), []))
+    
+    def _classify(self, source_item: Any, dest_lookup: Dict[str, Any], carried_over: set) -> WorkItem:
+        """Turn a source item into a prioritized write job"""
+        dest_item = dest_lookup.get(source_item["id"])
+        if dest_item is None:
+            priority = PRIORITY_NEW
+        elif self._status_changed(source_item, dest_item):
+            priority = PRIORITY_STATUS_CHANGED
+        else:
+            priority = PRIORITY_OTHER
+        return WorkItem(
+            source_item=source_item,
+            dest_item_id=dest_item["id"] if dest_item else None,
+            priority=priority,
+            carried_over=source_item["id"] in carried_over
+        )
+    
+    def _build_work(self, source_items: List[Any], dest_lookup: Dict[str, Any]) -> List[WorkItem]:
+        """Turn source items into prioritized write jobs"""
+        carried_over = self._carried_over_ids()
+        return [self._classify(source_item, dest_lookup, carried_over) for source_item in source_items]
+    
+    def _sync_item(self, job: WorkItem, columns_info: Dict, stats: Dict[str, int]) -> None:
+        """Write a single source item to the destination board"""
+        source_item = job.source_item
+        
+        # Check if this item has the completion status column
+        has_completion = bool(column_text(source_item, self.src_completion_col))
+        if has_completion:
+            logger.info(f"FOUND ITEM WITH COMPLETION STATUS: {source_item['name']}")
+        dest_item_id = job.dest_item_id
+        # Use the Monday.com item ID as the unique identifier
+        client_id = source_item["id"]
+        wrote = False
+        try:
+            logger.info(f"Processing item '{source_item['name']}' (ID: {client_id})")
+            
+            # Prepare column values for sync (unless the transform stage already did)
+            if job.payload is None and not job.transform_error:
+                job.payload, job.fingerprint = self.build_payload(source_item, columns_info)
+            
+            # Items that keep failing wait out their retry delay unless their data changed
+            if self.dead_letters is not None and self.dead_letters.should_skip(client_id, job.fingerprint):
+                logger.info(f"Skipping item '{source_item['name']}': in the dead-letter queue until its next retry")
+                stats["items_dead_lettered"] += 1
+            elif self._unchanged_since_written(job):
+                stats["items_skipped"] += 1
+            else:
+                if job.transform_error:
+                    raise Exception(job.transform_error)
+                column_values = job.payload
+                
+                wrote = True
+                # Check if item exists in destination
+                if job.dest_item_id:
+                    # Update existing item
+                    self.update_item(self.dest_board_id, job.dest_item_id, column_values)
+                    stats["items_updated"] += 1
+                else:
+                    # Create new item
+                    dest_item_id = self.create_item(self.dest_board_id, source_item["name"], column_values)
+                    stats["items_created"] += 1
+                    # Later links to this item can point at its copy
+                    if self.link_translator is not None:
+                        self.link_translator.record({client_id: dest_item_id})
+                
+                self._remember_write(job, dest_item_id)
+                if self.dead_letters is not None:
+                    self.dead_letters.record_success(client_id)
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_success()
+                
+        except Exception as e:
+            logger.error(f"Error processing item '{source_item.get('name', 'Unknown')}': {e}")
+            stats["errors"] += 1
+            # An auth failure isn't the item's fault, so it isn't parked
+            if self.dead_letters is not None and not is_auth_error(e):
+                self.dead_letters.record_failure(client_id, job.fingerprint, str(e))
+            # Only API failures say anything about the health of the run; raises once the breaker opens
+            if wrote and self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure(e)
+        
+        if self.snapshot is not None:
+            self.snapshot.add(source_item, dest_item_id)
+    
+    def _unchanged_since_written(self, job: WorkItem) -> bool:
+        """Whether this exact payload was already written to the item (daemon mode only)"""
+        if self.written_fingerprints is None or not job.dest_item_id or job.fingerprint is None:
+            return False
+        return self.written_fingerprints.get(job.source_id) == job.fingerprint
+    
+    def _remember_write(self, job: WorkItem, dest_item_id: str) -> None:
+        """Keep the daemon's warm caches in step with a successful write"""
+        if self.written_fingerprints is not None and job.fingerprint is not None:
+            self.written_fingerprints[job.source_id] = job.fingerprint
+        if self.warm_dest_lookup is not None and not job.dest_item_id:
+            # Later cycles must update this item rather than create it again
+            self.warm_dest_lookup[job.source_id] = {
+                "id": dest_item_id, "name": job.source_item["name"], "column_values": []
+            }
+    
+    def _run_schedule(self, scheduler: WorkScheduler, work: List[WorkItem], columns_info: Dict,
+                      stats: Dict[str, int]) -> List[WorkItem]:
+        """Write jobs in priority order until done, out of budget, or out of time; returns unfinished jobs"""
+        ordered = scheduler.order(work)
+        
+        index = 0
+        while index < len(ordered):
+            action, wait_seconds, reason = scheduler.next_action(self.complexity_remaining, self.complexity_reset_in)
+            if action == "stop":
+                logger.warning(f"Stopping early: {reason}. {len(ordered) - index} item(s) carried over to the next run")
+                break
+            if action == "wait":
+                logger.info(f"Waiting {wait_seconds:.0f}s for complexity budget reset: {reason}")
+                time.sleep(wait_seconds)
+                # Assume the budget is back after the reset; the next write reports the real value
+                self.complexity_remaining = None
+                continue
+            
+            try:
+                self._sync_item(ordered[index], columns_info, stats)
+            except CircuitOpenError as e:
+                e.unfinished = [job.source_id for job in ordered[index:]]
+                raise
+            index += 1
+        
+        return ordered[index:]
+    
+    def _sync_fetched_boards(self, scheduler: WorkScheduler, columns_info: Dict, stats: Dict[str, int]) -> List[str]:
+        """Fetch both boards completely, then write in priority order; returns unfinished source IDs"""
+        if self.prefetched_source is not None:
+            source_items = self.prefetched_source
+        else:
+            # Get all items from source board
+            logger.info(f"Fetching items from source board: {self.source_board_id}")
+            with self._phase("fetch_source"):
+                source_items = self.get_board_items(self.source_board_id, query_params=self.source_filter,
+                                                    on_page=self._export_page)
+        
+        if self.shard:
+            source_items = [item for item in source_items if self._in_shard(item)]
+            logger.info(f"Shard {self.shard[0]}/{self.shard[1]}: syncing {len(source_items)} source items")
+        if self.item_limit:
+            source_items = source_items[:self.item_limit]
+            logger.info(f"Limiting sync to the first {len(source_items)} source items")
+        
+        # Get all items from destination board
+        if self.warm_dest_lookup is not None:
+            dest_lookup = self.warm_dest_lookup
+            logger.info(f"Using the warm destination index ({len(dest_lookup)} items)")
+        else:
+            logger.info(f"Fetching items from destination board: {self.dest_board_id}")
+            with self._phase("fetch_dest"):
+                dest_items = self.get_board_items(self.dest_board_id)
+            
+            # Build a lookup map of destination items by source_item_id
+            dest_lookup: Dict[str, Any] = {}
+            logger.info(f"Looking for column '{self.source_item_id_column}' in {len(dest_items)} destination items")
+            with self._phase("index_dest"):
+                self._index_dest_items(dest_items, dest_lookup)
+            logger.info(f"Found {len(dest_lookup)} existing items with source_item_id populated")
+        
+        with self._phase("provision_labels"):
+            self._provision_labels(source_items, stats)
+        with self._phase("resolve_links"):
+            self._resolve_links(source_items, dest_lookup)
+        
+        # Process source items in priority order
+        with self._phase("build_work"):
+            work = self._build_work(source_items, dest_lookup)
+            if self.transform_workers > 0:
+                self._pretransform(work, columns_info)
+        with self._phase("write"):
+            remaining = self._run_schedule(scheduler, work, columns_info, stats)
+        return [job.source_id for job in remaining]
+    
     def sync_boards(self) -> Dict[str, int]:
         """Main sync function - syncs source board to destination board"""
         logger.info("=" * 60)
         logger.info(f"Starting sync at {datetime.now().isoformat()}")
         logger.info("=" * 60)
         
+        # The deadline counts from the start of the run, fetches included
+        scheduler = WorkScheduler(
+            deadline_seconds=self.deadline_seconds,
+            complexity_reserve=self.complexity_reserve,
+            stop_event=self.lease_lost
+        )
+        
         stats = {
             "items_created": 0,
             "items_updated": 0,
             "items_skipped": 0,
+            "items_deferred": 0,
+            "labels_created": 0,
+            "items_dead_lettered": 0,
             "errors": 0
         }
         
         try:
-            # Get all items from source board
-            logger.info(f"Fetching items from source board: {self.source_board_id}")
-            source_items = self.get_board_items(self.source_board_id)
-            
-            # Get all items from destination board
-            logger.info(f"Fetching items from destination board: {self.dest_board_id}")
-            dest_items = self.get_board_items(self.dest_board_id)
-            
             # Get column info
-            columns_info = self.get_column_mapping(self.source_board_id)
+            if self.warm_columns is not None:
+                columns_info = self.warm_columns
+            else:
+                with self._phase("fetch_columns"):
+                    columns_info = self.get_column_mapping(self.source_board_id)
+            if self.auto_match_columns and (self.warm_columns is None or self.column_plan is None):
+                self.apply_column_plan(columns_info)
+            self.exporter = self._open_exporter(columns_info)
+            if self.read_snapshot_enabled:
+                self.snapshot = SnapshotWriter(self.state, self.source_board_id)
+            if self.provision_labels:
+                self.label_provisioner = LabelProvisioner(self)
+            if self.dead_letter_enabled:
+                self.dead_letters = self.dead_letter_queue()
+            self.circuit_breaker = CircuitBreaker(self.breaker_error_rate, self.breaker_window)
             
-            # Build a lookup map of destination items by source_item_id
-            dest_lookup = {}
-            logger.info(f"Looking for column '{self.source_item_id_column}' in {len(dest_items)} destination items")
-            for item in dest_items:
-                for col_value in item["column_values"]:
-                    if col_value["id"] == self.source_item_id_column:
-                        source_id = col_value["text"]
-                        if source_id:
-                            dest_lookup[source_id] = item["id"]
-                            logger.debug(f"  Found mapping: source_id={source_id} -> dest_id={item['id']} ({item['name']})")
-                        break
+            if self.external_join:
+                # Constant memory: sorted runs on disk, merge-joined in one pass
+                remaining_ids = ExternalJoinSync(
+                    self, scheduler, columns_info, stats,
+                    run_items=self.external_run_items, work_dir=self.external_join_dir
+                ).run()
+            elif self.pipeline_enabled:
+                # Stream source pages through transform and write stages as they arrive
+                with self._phase("pipeline"):
+                    remaining_ids = SyncPipeline(self, scheduler, columns_info, stats).run()
+            else:
+                remaining_ids = self._sync_fetched_boards(scheduler, columns_info, stats)
             
-            logger.info(f"Found {len(dest_lookup)} existing items with source_item_id populated")
+            # Carry over whatever didn't fit in this run
+            stats["items_deferred"] = len(remaining_ids)
+            self.state.put("carry_over", self._pair_key(), remaining_ids)
             
-            # Process each source item
-            for source_item in source_items:
-                # Check if this item has the completion status column
-                has_completion = any(cv["id"] == self.src_completion_col and cv["text"] for cv in source_item["column_values"])
-                if has_completion:
-                    logger.info(f"FOUND ITEM WITH COMPLETION STATUS: {source_item['name']}")
-                try:
-                    # Use the Monday.com item ID as the unique identifier
-                    client_id = source_item["id"]
-                    
-                    logger.info(f"Processing item '{source_item['name']}' (ID: {client_id})")
-                    
-                    # Prepare column values for sync
-                    column_values = self.prepare_column_values(source_item, columns_info)
-                    
-                    # Add the source_item_id to track the relationship
-                    column_values[self.source_item_id_column] = client_id
-                    
-                    # Check if item exists in destination
-                    if client_id in dest_lookup:
-                        # Update existing item
-                        dest_item_id = dest_lookup[client_id]
-                        self.update_item(self.dest_board_id, dest_item_id, column_values)
-                        stats["items_updated"] += 1
-                    else:
-                        # Create new item
-                        self.create_item(self.dest_board_id, source_item["name"], column_values)
-                        stats["items_created"] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing item '{source_item.get('name', 'Unknown')}': {e}")
-                    stats["errors"] += 1
-                    continue
+            if self.updates_enabled:
+                with self._phase("updates"):
+                    stats.update(UpdatesSync(self, since=self.updates_since, scheduler=scheduler).run())
+            
+            if self.snapshot is not None:
+                # Items missing from a complete run were deleted on the source board
+                # (a shard only sees part of it, and the snapshot is shared by all shards)
+                complete = not (remaining_ids or self.source_filter or self.item_limit or self.shard)
+                self.snapshot.close(complete=complete)
+                self.snapshot = None
             
             logger.info("=" * 60)
             logger.info("Sync completed successfully!")
             logger.info(f"Items created: {stats['items_created']}")
             logger.info(f"Items updated: {stats['items_updated']}")
             logger.info(f"Items skipped: {stats['items_skipped']}")
+            logger.info(f"Items deferred: {stats['items_deferred']}")
+            logger.info(f"Labels created: {stats['labels_created']}")
+            logger.info(f"Items skipped (dead-letter backoff): {stats['items_dead_lettered']}")
+            if self.updates_enabled:
+                logger.info(f"Updates copied: {stats['updates_posted']} ({stats['updates_pending']} item(s) pending)")
             logger.info(f"Errors: {stats['errors']}")
             logger.info("=" * 60)
             
+        except CircuitOpenError as e:
+            # Keep the aborted run's unwritten items (and the carry-over it never reached) first in line
+            unfinished = set(e.unfinished)
+            previous = [source_id for source_id in self.state.get("carry_over", self._pair_key(), [])
+                        if source_id not in unfinished]
+            remaining_ids = e.unfinished + previous
+            stats["items_deferred"] = len(remaining_ids)
+            self.state.put("carry_over", self._pair_key(), remaining_ids)
+            logger.error(f"Fatal error during sync: {e}")
+            logger.warning(f"{len(remaining_ids)} item(s) carried over to the next run")
+            stats["errors"] += 1
+            raise
         except Exception as e:
             logger.error(f"Fatal error during sync: {e}")
             stats["errors"] += 1
             raise
+        finally:
+            if self.exporter is not None:
+                self.exporter.close()
+                self.exporter = None
+            if self.snapshot is not None:
+                # Keep what was written before the failure, without dropping anything
+                self.snapshot.close()
+                self.snapshot = None
+            self.label_provisioner = None
+            self.dead_letters = None
+            self.circuit_breaker = None
         
         return stats
 
 
-def main():
-    """Main entry point"""
+def build_syncer_from_env(shard: Optional[Tuple[int, int]] = None, require_token: bool = True) -> MondaySync:
+    """Create a MondaySync from environment variables"""
     # Load configuration from environment variables
     api_token = os.getenv("MONDAY_API_TOKEN")
     source_board_id = os.getenv("SOURCE_BOARD_ID", "")
     dest_board_id = os.getenv("DEST_BOARD_ID", "")
     source_item_id_column = os.getenv("SOURCE_ITEM_ID_COLUMN", "YOUR_SOURCE_ITEM_ID_COLUMN")
     
-    if not api_token:
+    if not api_token and require_token:
         logger.error("MONDAY_API_TOKEN environment variable not set!")
         raise ValueError("MONDAY_API_TOKEN is required")
     
-    # Initialize and run sync
-    syncer = MondaySync(
-        api_token=api_token,
+    return MondaySync(
+        api_token=api_token or "",
         source_board_id=source_board_id,
         dest_board_id=dest_board_id,
-        source_item_id_column=source_item_id_column
+        source_item_id_column=source_item_id_column,
+        shard=shard
     )
+
+
+def run_verify(syncer: MondaySync, args: argparse.Namespace) -> int:
+    """Compare both boards; returns the process exit code (1 on drift)"""
+    ignore_columns = list(args.ignore_column)
+    ignore_columns += [col for col in os.getenv("VERIFY_IGNORE_COLUMNS", "").split(",") if col]
+    
+    report = BoardVerifier(syncer, ignore_columns).run()
+    report.log_summary()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        logger.info(f"Wrote verification report to {args.report}")
+    return 1 if report.has_drift else 0
+
+
+def run_sync(syncer: MondaySync, base_metrics_path: str, shard: Optional[Tuple[int, int]]) -> int:
+    """One sync run into DEST_BOARD_ID or every SYNC_DESTINATIONS board; returns the exit code"""
+    destinations = parse_destinations(os.getenv("SYNC_DESTINATIONS", ""))
+    if not destinations:
+        stats = syncer.sync_boards()
+        write_metrics(stats, metrics_path(base_metrics_path, shard), shard)
+        return 0
+    
+    results = FanOutSync(syncer, destinations).run()
+    totals: Dict[str, int] = {}
+    for dest_stats in results.values():
+        for key, value in dest_stats.items():
+            totals[key] = totals.get(key, 0) + value
+    write_metrics(totals, metrics_path(base_metrics_path, shard), shard, destinations=results)
+    return 1 if totals.get("failed") else 0
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Sync a Monday.com source board to a destination board")
+    parser.add_argument("--shard", help="Only sync shard i of N (0-based), e.g. --shard 0/4")
+    parser.add_argument("--merge-metrics", nargs="+", metavar="PATTERN",
+                        help="Merge per-shard metrics files into SYNC_METRICS_PATH and exit")
+    parser.add_argument("--limit", type=int, default=0, help="Only sync the first N source items (for testing)")
+    parser.add_argument("--profile", nargs="?", const="profile", metavar="DIR",
+                        help="Profile the run (cProfile, tracemalloc, sampled stacks) and write results to DIR")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE", help="Record all API exchanges to this file")
+    cassette.add_argument("--replay", metavar="CASSETTE", help="Replay API exchanges from this file (no network)")
+    parser.add_argument("--replay-loose", action="store_true",
+                        help="During --replay, answer requests whose variables changed by query alone (logged)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    verify_parser = subparsers.add_parser("verify", help="Check the destination board against the source board (exit 1 on drift)")
+    verify_parser.add_argument("--report", help="Also write the full report as JSON to this file")
+    verify_parser.add_argument("--ignore-column", action="append", default=[], metavar="COLUMN_ID",
+                               help="Destination column to leave out of the comparison (repeatable)")
+    verify_parser.set_defaults(handler=run_verify)
+    
+    repair_parser = subparsers.add_parser("repair", help="Find duplicate/unmapped destination items and merge or archive them")
+    repair_parser.add_argument("--apply", action="store_true", help="Write the repair (default: dry run)")
+    repair_parser.add_argument("--match-column", action="append", metavar="SOURCE_COLUMN_ID",
+                               help="Column that must match, besides the name, to tie an unmapped item to a source item "
+                                    "(repeatable; default: REPAIR_MATCH_COLUMNS)")
+    repair_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Mutations per request")
+    repair_parser.add_argument("--report", help="Also write the repair plan as JSON to this file")
+    repair_parser.set_defaults(handler=run_repair)
     
-    syncer.sync_boards()
+    backfill_parser = subparsers.add_parser("backfill", help="Copy every missing source item, reading board groups in parallel")
+    backfill_parser.add_argument("--workers", type=int, default=int(os.getenv("BACKFILL_WORKERS", "4")),
+                                 help="Groups read and written at the same time")
+    backfill_parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Items created per request")
+    backfill_parser.set_defaults(handler=run_backfill)
+    
+    updates_parser = subparsers.add_parser("updates", help="Copy new item updates (comments) to the destination copies")
+    updates_parser.add_argument("--batch-size", type=int, default=UPDATES_BATCH_SIZE, help="Updates posted per request")
+    updates_parser.add_argument("--since", default=os.getenv("UPDATES_SINCE") or None, metavar="ISO_TIME",
+                                help="Skip updates older than this (e.g. on the first run of a board with a long history)")
+    updates_parser.set_defaults(handler=run_updates)
+    
+    bidi_parser = subparsers.add_parser("bidirectional", help="Sync field changes both ways using stored base values")
+    bidi_parser.add_argument("--policy", choices=CONFLICT_POLICIES, default=os.getenv("BIDI_CONFLICT_POLICY", "source"),
+                             help="Which side wins when both changed the same field ('skip' leaves both as they are)")
+    bidi_parser.set_defaults(handler=run_bidirectional)
+    
+    daemon_parser = subparsers.add_parser("daemon", help="Keep running, syncing on an adaptive interval with warm caches")
+    daemon_parser.add_argument("--min-interval", type=float, default=float(os.getenv("SYNC_DAEMON_MIN_INTERVAL", "60")),
+                               help="Shortest time between cycles in seconds (used while items keep changing)")
+    daemon_parser.add_argument("--max-interval", type=float, default=float(os.getenv("SYNC_DAEMON_MAX_INTERVAL", "1800")),
+                               help="Longest time between cycles in seconds (reached while the board is idle)")
+    daemon_parser.add_argument("--refresh-every", type=int, default=int(os.getenv("SYNC_DAEMON_REFRESH_CYCLES", "12")),
+                               help="Refetch the schema and destination board every N cycles")
+    daemon_parser.set_defaults(handler=run_daemon)
+    
+    match_parser = subparsers.add_parser("match-columns", help="Show which destination column each source column is synced to")
+    match_parser.add_argument("--refresh", action="store_true", help="Work the plan out again even if the schemas are unchanged")
+    match_parser.set_defaults(handler=run_match_columns)
+    
+    serve_parser = subparsers.add_parser("serve", help="Serve the last synced snapshot over a local HTTP read API")
+    serve_parser.add_argument("--host", default=os.getenv("READ_API_HOST", "127.0.0.1"))
+    serve_parser.add_argument("--port", type=int, default=int(os.getenv("READ_API_PORT", "8080")))
+    serve_parser.set_defaults(handler=run_serve)
+    
+    add_diagnostic_commands(subparsers)
+    args = parser.parse_args()
+    
+    base_metrics_path = os.getenv("SYNC_METRICS_PATH", "sync_metrics.json")
+    if args.merge_metrics:
+        merge_metrics(args.merge_metrics, base_metrics_path)
+        return
+    
+    shard = parse_shard(args.shard) if args.shard else None
+    syncer = build_syncer_from_env(shard, require_token=not args.replay)
+    if args.record:
+        syncer.use_cassette("record", args.record)
+    elif args.replay:
+        syncer.use_cassette("replay", args.replay, loose=args.replay_loose)
+    
+    if syncer.auto_match_columns and args.command in PLANNED_COMMANDS:
+        syncer.apply_column_plan()
+    
+    # Only one writing run per board pair (and shard) at a time
+    lease = None
+    lease_ttl = float(os.getenv("SYNC_LEASE_TTL_SECONDS", "600"))
+    if lease_ttl > 0 and (not args.command or args.command in LEASED_COMMANDS):
+        lease = RunLease(syncer.state, syncer._pair_key(), lease_ttl)
+        queue_follow_up = not args.command and os.getenv("SYNC_LEASE_ON_OVERLAP", "queue") == "queue"
+        if not lease.acquire(queue_follow_up=queue_follow_up):
+            logger.warning("Another sync of this board pair is still running; exiting")
+            return
+        syncer.lease_lost = lease.lost
+    
+    profiler = None
+    if args.profile:
+        from profiling import HOT_PATH_METHODS, SyncProfiler
+        profiler = SyncProfiler(args.profile)
+        profiler.wrap(syncer, HOT_PATH_METHODS)
+        syncer.profiler = profiler
+        profiler.start()
+    
+    try:
+        if args.command:
+            exit_code = args.handler(syncer, args)
+            sys.exit(max(exit_code, 1) if syncer.lease_is_lost() else exit_code)
+        
+        # Run sync (again, while overlapping invocations queued a follow-up)
+        syncer.item_limit = args.limit
+        exit_code = run_sync(syncer, base_metrics_path, shard)
+        while lease is not None and lease.finish():
+            exit_code = max(exit_code, run_sync(syncer, base_metrics_path, shard))
+        if syncer.lease_is_lost():
+            exit_code = max(exit_code, 1)
+        if exit_code:
+            sys.exit(exit_code)
+    finally:
+        if lease is not None:
+            lease.release()
+        if profiler is not None:
+            profiler.stop()
 
 
 if __name__ == "__main__":
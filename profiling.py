@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling of a sync run (--profile)
+
+Writes these artifacts to the profile directory:
+    profile.pstats      cProfile stats of the main thread (open with pstats or snakeviz)
+    profile.collapsed   sampled stacks of all threads, in collapsed format for flamegraph.pl/speedscope
+    profile_alloc.txt   top allocation sites by size (tracemalloc)
+    profile_summary.json  wall time and peak memory per phase, timings of per-item calls
+
+Nothing here is imported or run unless profiling is turned on; phases fall back to
+a no-op context manager and per-item methods are only wrapped while profiling.
+"""
+
+import collections
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Per-item MondaySync methods timed individually
+HOT_PATH_METHODS = ["prepare_column_values", "update_item", "create_item"]
+
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 25
+
+
+class StackSampler:
+    """Samples the stacks of all other threads at a fixed interval"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.counts: Dict[str, int] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class SyncProfiler:
+    """cProfile + tracemalloc + stack sampling for one run, with per-phase timings"""
+
+    def __init__(self, output_dir: str = "profile", top_n: int = 30, sample_interval: float = 0.01):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(sample_interval)
+        # phase -> {"seconds", "peak_mb"}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        # method -> {"calls", "seconds", "max_seconds"}
+        self.calls: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, obj: Any, method_names: List[str]) -> None:
+        """Time every call of these methods on obj and on copies made of it
+
+        The timed methods live on a subclass made for obj rather than on the instance,
+        so copies (fan-out destinations etc.) still run with their own attributes.
+        """
+        cls = type(obj)
+        timed = {}
+        for name in method_names:
+            self.calls[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0}
+            timed[name] = self._timed(name, getattr(cls, name))
+        obj.__class__ = type(f"Profiled{cls.__name__}", (cls,), timed)
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    entry = self.calls[name]
+                    entry["calls"] += 1
+                    entry["seconds"] += elapsed
+                    entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+        return timed
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record wall time and peak traced memory of one phase of the run"""
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            entry = self.phases.setdefault(name, {"seconds": 0.0, "peak_mb": 0.0})
+            entry["seconds"] += elapsed
+            entry["peak_mb"] = max(entry["peak_mb"], peak)
+            logger.info(f"[profile] {name}: {elapsed:.2f}s, peak {peak:.1f} MB")
+
+    def start(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.sampler.start()
+        self.profile.enable()
+        logger.info(f"Profiling enabled, writing results to {self.output_dir}/")
+
+    def stop(self) -> None:
+        """Stop profiling and write all artifacts"""
+        self.profile.disable()
+        self.sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        self.profile.dump_stats(os.path.join(self.output_dir, "profile.pstats"))
+        self.sampler.write(os.path.join(self.output_dir, "profile.collapsed"))
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        with open(os.path.join(self.output_dir, "profile_alloc.txt"), "w") as f:
+            for stat in snapshot.statistics("lineno")[:self.top_n]:
+                f.write(f"{stat}\n")
+
+        with open(os.path.join(self.output_dir, "profile_summary.json"), "w") as f:
+            json.dump({"phases": self.phases, "calls": self.calls}, f, indent=2)
+
+        for name, entry in self.calls.items():
+            if entry["calls"]:
+                logger.info(f"[profile] {name}: {entry['calls']} calls, {entry['seconds']:.2f}s total, "
+                            f"{entry['seconds'] / entry['calls'] * 1000:.1f}ms avg, {entry['max_seconds'] * 1000:.0f}ms max")
+        summary = io.StringIO()
+        pstats.Stats(self.profile, stream=summary).sort_stats("cumulative").print_stats(15)
+        logger.info(f"[profile] top functions by cumulative time:\n{summary.getvalue()}")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Client-side request rate limiting shared by everything that uses one MondaySync client
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """Token bucket allowing at most `per_minute` requests per minute (0 = unlimited)"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.per_minute = per_minute
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(per_minute)
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        if self.per_minute <= 0:
+            return
+
+        rate = self.per_minute / 60.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.per_minute, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / rate
+            self.sleep(wait)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local read API over the last synced snapshot of the source board
+
+Services that only need to read lead data can query this instead of the Monday
+API, so their traffic doesn't count against the complexity budget. Each sync
+writes a snapshot of the items it processed into the state store
+(SYNC_READ_SNAPSHOT=1), and `monday_sync.py serve` answers from it:
+
+    GET  /items/<item_id>            source item ID or destination item ID
+    GET  /items?<column_id>=<text>   filtered listing (also q=, source_item_id=, limit=, offset=)
+    GET  /health                     snapshot generation and size
+    POST /webhook                    Monday webhook target; refreshes changed items
+
+The server picks up a new snapshot as soon as a sync finishes, and webhook
+events refresh single items in between syncs. Webhook requests must carry a JWT
+signed with READ_API_WEBHOOK_SECRET (Monday's signing secret) in the
+Authorization header, or READ_API_WEBHOOK_TOKEN as the token query parameter;
+without either setting the webhook is disabled.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAMESPACE = "read_snapshot"
+META_NAMESPACE = "read_snapshot_meta"
+
+# Snapshot rows are written in batches of this many items
+FLUSH_EVERY = 500
+
+DEFAULT_LIST_LIMIT = 100
+MAX_LIST_LIMIT = 1000
+
+# Webhook events that mean an item's data changed or the item went away
+CHANGE_EVENTS = {"create_pulse", "update_column_value", "change_column_value", "update_name", "change_name"}
+DELETE_EVENTS = {"delete_pulse", "archive_pulse"}
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def verify_jwt(token: str, secret: str) -> bool:
+    """Check an HS256 JWT's signature and expiry against the signing secret"""
+    try:
+        header, payload, signature = token.split(".")
+        if json.loads(_b64decode(header)).get("alg") != "HS256":
+            return False
+        expected = hmac.new(secret.encode("utf-8"), f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return False
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, UnicodeError):
+        return False
+    return not (isinstance(claims, dict) and "exp" in claims and claims["exp"] < time.time())
+
+
+def snapshot_record(item: Any, dest_item_id: Optional[str], generation: float) -> Dict:
+    """JSON-serializable snapshot entry for one source item"""
+    return {
+        "id": item["id"],
+        "name": item["name"],
+        "dest_item_id": dest_item_id,
+        "columns": {col["id"]: col["text"] for col in item["column_values"]},
+        "generation": generation,
+    }
+
+
+class SnapshotWriter:
+    """Collects the items a sync processed and writes them to the state store in batches"""
+
+    def __init__(self, state, board_id: str):
+        self.state = state
+        self.namespace = f"{SNAPSHOT_NAMESPACE}:{board_id}"
+        self.board_id = str(board_id)
+        self.generation = time.time()
+        self.written = 0
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, item: Any, dest_item_id: Optional[str]) -> None:
+        with self._lock:
+            self._pending[item["id"]] = snapshot_record(item, dest_item_id, self.generation)
+            if len(self._pending) >= FLUSH_EVERY:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self.state.put_many(self.namespace, self._pending)
+            self.written += len(self._pending)
+            self._pending = {}
+
+    def close(self, complete: bool = False) -> None:
+        """Write what's left and publish the new generation
+
+        With complete=True the sync covered every source item, so entries from
+        older generations belong to deleted items and are dropped.
+        """
+        with self._lock:
+            self._flush()
+        if complete:
+            stale = [
+                item_id for item_id, record in self.state.items(self.namespace).items()
+                if record["generation"] != self.generation
+            ]
+            self.state.delete_many(self.namespace, stale)
+            if stale:
+                logger.info(f"Removed {len(stale)} deleted items from the read snapshot")
+        self.state.put(META_NAMESPACE, self.board_id, {
+            "generation": self.generation,
+            "synced_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.generation)),
+        })
+        logger.info(f"Read snapshot updated with {self.written} items")
+
+
+class SnapshotIndex:
+    """In-memory view of the snapshot, reloaded when a sync publishes a new generation"""
+
+    def __init__(self, syncer):
+        self.syncer = syncer
+        self.state = syncer.state
+        self.board_id = str(syncer.source_board_id)
+        self.namespace = f"{SNAPSHOT_NAMESPACE}:{self.board_id}"
+        self.generation: Optional[float] = None
+        self.synced_at: Optional[str] = None
+        self.by_id: Dict[str, Dict] = {}
+        self.by_dest_id: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        """Reload the snapshot if a sync finished since the last load (one row read otherwise)"""
+        meta = self.state.get(META_NAMESPACE, self.board_id)
+        if meta is None or meta["generation"] == self.generation:
+            return
+        records = self.state.items(self.namespace)
+        with self._lock:
+            self.by_id = records
+            self.by_dest_id = {
+                record["dest_item_id"]: item_id for item_id, record in records.items() if record["dest_item_id"]
+            }
+            self.generation = meta["generation"]
+            self.synced_at = meta["synced_at"]
+        logger.info(f"Loaded read snapshot from {self.synced_at} ({len(records)} items)")
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        """Look up by source item ID (= the destination's source_item_id) or destination item ID"""
+        self._refresh()
+        with self._lock:
+            record = self.by_id.get(item_id)
+            if record is None and item_id in self.by_dest_id:
+                record = self.by_id.get(self.by_dest_id[item_id])
+            return record
+
+    def list(self, column_filters: Dict[str, str], name_contains: Optional[str],
+             limit: int, offset: int) -> Tuple[int, List[Dict]]:
+        """Items whose column texts equal the filters (case-insensitive); returns (total, page)"""
+        self._refresh()
+        wanted = {col_id: value.lower() for col_id, value in column_filters.items()}
+        needle = name_contains.lower() if name_contains else None
+        with self._lock:
+            records = list(self.by_id.values())
+        matches = [
+            record for record in records
+            if (needle is None or needle in record["name"].lower())
+            and all((record["columns"].get(col_id) or "").lower() == value for col_id, value in wanted.items())
+        ]
+        return len(matches), matches[offset:offset + limit]
+
+    def apply_webhook(self, event: Dict) -> str:
+        """Refresh or drop one item after a Monday webhook event; returns what was done"""
+        item_id = str(event.get("pulseId") or event.get("itemId") or "")
+        if not item_id or str(event.get("boardId")) != self.board_id:
+            return "ignored"
+
+        if event.get("type") in DELETE_EVENTS:
+            with self._lock:
+                record = self.by_id.pop(item_id, None)
+                if record and record["dest_item_id"]:
+                    self.by_dest_id.pop(record["dest_item_id"], None)
+            self.state.delete(self.namespace, item_id)
+            return "deleted"
+
+        if event.get("type") not in CHANGE_EVENTS:
+            return "ignored"
+
+        # One API read per changed item instead of one per client request
+        items = self.syncer.get_items([item_id])
+        if not items:
+            return "not found"
+        with self._lock:
+            previous = self.by_id.get(item_id)
+            record = snapshot_record(items[0], previous["dest_item_id"] if previous else None,
+                                     previous["generation"] if previous else self.generation or 0)
+            self.by_id[item_id] = record
+        self.state.put(self.namespace, item_id, record)
+        return "refreshed"
+
+
+class ReadApiHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's SnapshotIndex"""
+
+    server: "ReadApiServer"
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        index = self.server.index
+
+        if parts == ["health"]:
+            index._refresh()
+            self._send(200, {"generation": index.generation, "synced_at": index.synced_at, "items": len(index.by_id)})
+            return
+
+        if len(parts) == 2 and parts[0] == "items":
+            record = index.get(parts[1])
+            if record is None:
+                self._send(404, {"error": f"item {parts[1]} not in snapshot"})
+            else:
+                self._send(200, record)
+            return
+
+        if parts == ["items"]:
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                limit = min(int(params.pop("limit", DEFAULT_LIST_LIMIT)), MAX_LIST_LIMIT)
+                offset = max(int(params.pop("offset", 0)), 0)
+            except ValueError:
+                self._send(400, {"error": "limit and offset must be integers"})
+                return
+            name_contains = params.pop("q", None)
+            source_item_id = params.pop("source_item_id", None)
+            if source_item_id is not None:
+                record = index.get(source_item_id)
+                records = [record] if record and record["id"] == source_item_id else []
+                self._send(200, {"total": len(records), "items": records})
+                return
+            total, records = index.list(params, name_contains, limit, offset)
+            self._send(200, {"total": total, "items": records})
+            return
+
+        self._send(404, {"error": "not found"})
+
+    def _webhook_authorized(self, url) -> bool:
+        server = self.server
+        if server.webhook_secret:
+            token = self.headers.get("Authorization", "")
+            if token.startswith("Bearer "):
+                token = token[len("Bearer "):]
+            if token and verify_jwt(token, server.webhook_secret):
+                return True
+        if server.webhook_token:
+            given = (parse_qs(url.query).get("token") or [""])[-1]
+            if hmac.compare_digest(given.encode("utf-8"), server.webhook_token.encode("utf-8")):
+                return True
+        return False
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/webhook":
+            self._send(404, {"error": "not found"})
+            return
+        if not (self.server.webhook_secret or self.server.webhook_token):
+            self._send(403, {"error": "webhook disabled; set READ_API_WEBHOOK_SECRET or READ_API_WEBHOOK_TOKEN"})
+            return
+        if not self._webhook_authorized(url):
+            logger.warning(f"Rejected unauthorized webhook request from {self.address_string()}")
+            self._send(401, {"error": "unauthorized"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+
+        # Monday verifies a new webhook URL by sending a challenge that must be echoed back
+        if "challenge" in body:
+            self._send(200, {"challenge": body["challenge"]})
+            return
+
+        try:
+            result = self.server.index.apply_webhook(body.get("event") or {})
+        except Exception as e:
+            logger.error(f"Webhook refresh failed: {e}")
+            self._send(502, {"error": str(e)})
+            return
+        self._send(200, {"result": result})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class ReadApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering reads from the local snapshot"""
+
+    daemon_threads = True
+
+    def __init__(self, syncer, host: str = "127.0.0.1", port: int = 8080,
+                 webhook_secret: str = "", webhook_token: str = ""):
+        self.index = SnapshotIndex(syncer)
+        # Webhook requests are only accepted with a valid signature or token
+        self.webhook_secret = webhook_secret
+        self.webhook_token = webhook_token
+        super().__init__((host, port), ReadApiHandler)
+
+
+def run_serve(syncer, args) -> int:
+    """Serve the read API until interrupted"""
+    server = ReadApiServer(syncer, args.host, args.port,
+                           webhook_secret=os.getenv("READ_API_WEBHOOK_SECRET", ""),
+                           webhook_token=os.getenv("READ_API_WEBHOOK_TOKEN", ""))
+    host, port = server.server_address[:2]
+    logger.info(f"Read API listening on http://{host}:{port} (board {syncer.source_board_id})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Detect and repair duplicate and unmapped items on the destination board
+
+Builds a full index of the destination board and finds:
+- duplicates: several destination items with the same source_item_id
+- unmapped: destination items with an empty source_item_id column (e.g. left
+  behind when a create succeeded but the ID column wasn't written)
+
+Unmapped items are matched back to source items by name plus optional key
+columns. An unmapped item that matches a source item without a destination copy
+is adopted (its source_item_id is filled in); otherwise it is an extra copy.
+For each source item the copy with the lowest item ID is kept, values only the
+extras have are merged into it, and the extras are archived. Writes are sent as
+batched mutations, and nothing is written unless --apply is given.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from board_model import column_text
+
+logger = logging.getLogger(__name__)
+
+# Mutations per batched request
+DEFAULT_BATCH_SIZE = 25
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+@dataclass
+class RepairPlan:
+    """What a repair run found and will do"""
+    dest_items: int = 0
+    # source_id -> destination item IDs sharing it (keeper first)
+    duplicates: Dict[str, List[str]] = field(default_factory=dict)
+    # Unmapped destination items: matched ones are in adopt/archive, the rest stay here
+    unmatched: List[str] = field(default_factory=list)
+    # (dest item ID, source ID) to fill in
+    adopt: List[Tuple[str, str]] = field(default_factory=list)
+    # keeper dest item ID -> column values merged in from its extras
+    merge: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Destination item IDs to archive
+    archive: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "dest_items": self.dest_items,
+            "duplicates": self.duplicates,
+            "unmatched": self.unmatched,
+            "adopt": [{"dest_item_id": dest, "source_item_id": src} for dest, src in self.adopt],
+            "merge": self.merge,
+            "archive": self.archive,
+        }
+
+    def log_summary(self) -> None:
+        logger.info("=" * 60)
+        logger.info(f"Destination items: {self.dest_items}")
+        logger.info(f"Duplicated source IDs: {len(self.duplicates)}")
+        logger.info(f"Unmapped items adopted: {len(self.adopt)}")
+        logger.info(f"Unmapped items without a unique match (left alone): {len(self.unmatched)}")
+        logger.info(f"Items receiving merged values: {len(self.merge)}")
+        logger.info(f"Items to archive: {len(self.archive)}")
+        logger.info("=" * 60)
+
+
+class BoardRepairer:
+    """Plans and applies a repair of the destination board"""
+
+    def __init__(self, syncer, match_columns: Optional[List[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.syncer = syncer
+        # Source column IDs that must match as well as the name
+        self.match_columns = match_columns or []
+        self.batch_size = batch_size
+
+    def _key_columns(self) -> List[str]:
+        """Match columns that have a destination column (the column plan maps excluded ones to None)"""
+        mapping = self.syncer.column_id_mapping
+        return [col for col in self.match_columns if mapping.get(col, col) is not None]
+
+    def _source_key(self, item: Any) -> Tuple[str, ...]:
+        return (_normalize(item["name"]),) + tuple(_normalize(column_text(item, col)) for col in self._key_columns())
+
+    def _dest_key(self, item: Any) -> Tuple[str, ...]:
+        mapping = self.syncer.column_id_mapping
+        return (_normalize(item["name"]),) + tuple(
+            _normalize(column_text(item, mapping.get(col, col))) for col in self._key_columns()
+        )
+
+    def _values(self, item: Any) -> Dict[str, Any]:
+        """Writable column values of a destination item, keyed by destination column ID"""
+        values = self.syncer.prepare_column_values(item, {}, {}, verbose=False)
+        values.pop(self.syncer.source_item_id_column, None)
+        return values
+
+    def plan(self) -> RepairPlan:
+        """Index both boards and work out the repair (no writes)"""
+        syncer = self.syncer
+        plan = RepairPlan()
+
+        copies: Dict[str, List[Any]] = {}
+        unmapped: List[Any] = []
+        for page in syncer.iter_board_item_pages(syncer.dest_board_id):
+            for item in page:
+                plan.dest_items += 1
+                source_id = column_text(item, syncer.source_item_id_column)
+                if source_id:
+                    copies.setdefault(source_id, []).append(item)
+                else:
+                    unmapped.append(item)
+
+        if unmapped:
+            by_key: Dict[Tuple[str, ...], List[str]] = {}
+            for page in syncer.iter_board_item_pages(syncer.source_board_id):
+                for item in page:
+                    by_key.setdefault(self._source_key(item), []).append(item["id"])
+            for item in unmapped:
+                matches = by_key.get(self._dest_key(item), [])
+                if len(matches) != 1:
+                    plan.unmatched.append(item["id"])
+                    continue
+                copies.setdefault(matches[0], []).append(item)
+
+        for source_id, items in copies.items():
+            # Prefer an item that already carries the ID, then the oldest
+            items = sorted(items, key=lambda item: (not column_text(item, syncer.source_item_id_column),
+                                                    int(item["id"])))
+            keeper, extras = items[0], items[1:]
+            if not column_text(keeper, syncer.source_item_id_column):
+                plan.adopt.append((keeper["id"], source_id))
+            if not extras:
+                continue
+            plan.duplicates[source_id] = [item["id"] for item in items]
+
+            keeper_values = self._values(keeper)
+            merged: Dict[str, Any] = {}
+            for extra in extras:
+                for col_id, value in self._values(extra).items():
+                    if col_id not in keeper_values and col_id not in merged:
+                        merged[col_id] = value
+            if merged:
+                plan.merge[keeper["id"]] = merged
+            plan.archive.extend(item["id"] for item in extras)
+        return plan
+
+    def _run_batches(self, kind: str, operations: List[Tuple[str, Optional[Dict[str, Any]]]]) -> int:
+        """Send (item ID, column values or None to archive) operations as aliased mutations; returns failures"""
+        failures = 0
+        for start in range(0, len(operations), self.batch_size):
+            if self.syncer.lease_is_lost():
+                logger.error(f"{kind}: run lease lost, stopping with {len(operations) - start} operation(s) left")
+                return failures + len(operations) - start
+            batch = operations[start:start + self.batch_size]
+            definitions = []
+            fields = []
+            variables: Dict[str, Any] = {}
+            if any(values is not None for _, values in batch):
+                definitions.append("$boardId: ID!")
+                variables["boardId"] = self.syncer.dest_board_id
+            for position, (item_id, values) in enumerate(batch):
+                definitions.append(f"$item{position}: ID!")
+                variables[f"item{position}"] = item_id
+                if values is None:
+                    fields.append(f"a{position}: archive_item(item_id: $item{position}) {{ id }}")
+                else:
+                    definitions.append(f"$values{position}: JSON!")
+                    variables[f"values{position}"] = json.dumps(values)
+                    fields.append(
+                        f"u{position}: change_multiple_column_values(board_id: $boardId, "
+                        f"item_id: $item{position}, column_values: $values{position}) {{ id }}"
+                    )
+            query = "mutation (%s) {\n    %s\n}" % (", ".join(definitions), "\n    ".join(fields))
+            try:
+                self.syncer._execute_query(query, variables)
+                logger.info(f"{kind}: {start + len(batch)}/{len(operations)} done")
+            except Exception as e:
+                logger.error(f"{kind} batch starting at {start} failed: {e}")
+                failures += len(batch)
+        return failures
+
+    def apply(self, plan: RepairPlan) -> int:
+        """Write the plan: adopt, merge, then archive; returns the number of failed operations"""
+        id_column = self.syncer.source_item_id_column
+        failures = self._run_batches("Adopt", [(dest_id, {id_column: src}) for dest_id, src in plan.adopt])
+        failures += self._run_batches("Merge", list(plan.merge.items()))
+        # Only archive once the keepers hold everything
+        if failures:
+            logger.error("Not archiving duplicates because some adopt/merge writes failed")
+            return failures + len(plan.archive)
+        return self._run_batches("Archive", [(dest_id, None) for dest_id in plan.archive])
+
+
+def run_repair(syncer, args) -> int:
+    """Find duplicate/unmapped destination items and (with --apply) repair them"""
+    match_columns = args.match_column or [col for col in os.getenv("REPAIR_MATCH_COLUMNS", "").split(",") if col]
+    repairer = BoardRepairer(syncer, match_columns, args.batch_size)
+    plan = repairer.plan()
+    plan.log_summary()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(plan.to_dict(), f, indent=2)
+        logger.info(f"Wrote repair plan to {args.report}")
+
+    if not args.apply:
+        logger.info("Dry run - nothing was changed. Re-run with --apply to repair the board")
+        return 0
+    failures = repairer.apply(plan)
+    return 1 if failures else 0
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Run lease that keeps two syncs of the same board pair from overlapping
+
+The lease is a row in the state store holding the owner and an expiry time. The
+holder renews it from a heartbeat thread, so a process that dies without
+releasing it only blocks others until the lease expires. A holder that finds
+its lease taken over stops writing. An invocation that finds the lease taken
+either exits right away or leaves a follow-up request on the lease. The holder
+then runs one more sync before releasing it; several overlapping invocations
+still queue only a single follow-up.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAMESPACE = "run_lease"
+
+
+class RunLease:
+    """Exclusive, expiring lease on one board pair, renewed by a heartbeat while held"""
+
+    def __init__(self, state: StateStore, name: str, ttl_seconds: float = 300):
+        self.state = state
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Set when the heartbeat finds that the lease expired and was taken over
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def _held_by_other(self, lease: Optional[Dict[str, Any]], now: float) -> bool:
+        return lease is not None and lease["owner"] != self.owner and lease["expires_at"] > now
+
+    def acquire(self, queue_follow_up: bool = False) -> bool:
+        """Take the lease unless another live owner holds it; starts the heartbeat on success
+
+        With queue_follow_up, a lease held by someone else is flagged (in the same
+        step) so its holder runs once more before releasing it.
+        """
+        def take(lease: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            now = time.time()
+            if self._held_by_other(lease, now):
+                return dict(lease, follow_up=True) if queue_follow_up else lease
+            if lease is not None and lease["owner"] != self.owner and lease["expires_at"] > 0:
+                logger.warning(f"Taking over expired run lease from {lease['owner']}")
+            # This run covers any follow-up still pending on an expired lease
+            return {"owner": self.owner, "acquired_at": now, "expires_at": now + self.ttl_seconds, "follow_up": False}
+
+        lease = self.state.update(LEASE_NAMESPACE, self.name, take)
+        if lease["owner"] != self.owner:
+            expires_in = lease["expires_at"] - time.time()
+            logger.info(f"Run lease for {self.name} is held by {lease['owner']} (expires in {expires_in:.0f}s)"
+                        + ("; queued a follow-up run" if queue_follow_up else ""))
+            return False
+
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=self._renew_until_stopped, name="lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+        logger.info(f"Acquired run lease for {self.name}")
+        return True
+
+    def renew(self) -> bool:
+        """Push the expiry out; returns False if the lease now belongs to someone else"""
+        def extend(lease: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if lease is None or lease["owner"] != self.owner:
+                return lease
+            return dict(lease, expires_at=time.time() + self.ttl_seconds)
+
+        lease = self.state.update(LEASE_NAMESPACE, self.name, extend)
+        return lease is not None and lease["owner"] == self.owner
+
+    def _renew_until_stopped(self) -> None:
+        while not self._stop.wait(self.ttl_seconds / 3):
+            try:
+                if not self.renew():
+                    logger.error(f"Run lease for {self.name} was taken over by another process")
+                    self.lost.set()
+                    return
+            except Exception as e:
+                # Keep trying; the lease only lapses after a full TTL without renewal
+                logger.warning(f"Could not renew run lease: {e}")
+
+    def finish(self) -> bool:
+        """Release the lease, unless a follow-up run was requested meanwhile
+
+        Checked and released in one step, so a request can't slip in between.
+        Returns True (still holding the lease) if the caller should run once more.
+        """
+        if self.lost.is_set():
+            # The new holder runs its own sync; any follow-up request is now its to serve
+            logger.error(f"Run lease for {self.name} was lost during the run; not running a follow-up")
+            self.release()
+            return False
+        follow_up = []
+
+        def finish_or_continue(lease: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if lease is None or lease["owner"] != self.owner:
+                return lease
+            if lease.get("follow_up"):
+                follow_up.append(True)
+                return dict(lease, follow_up=False)
+            return dict(lease, expires_at=0)
+
+        self.state.update(LEASE_NAMESPACE, self.name, finish_or_continue)
+        if follow_up:
+            logger.info(f"Running the follow-up sync requested while {self.name} was running")
+            return True
+        self.release()
+        return False
+
+    def release(self) -> None:
+        """Stop the heartbeat and drop the lease if it is still ours"""
+        if self._heartbeat is None:
+            return
+        self._stop.set()
+        self._heartbeat.join()
+        self._heartbeat = None
+
+        def drop(lease: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if lease is None or lease["owner"] != self.owner:
+                return lease
+            return dict(lease, expires_at=0)
+
+        self.state.update(LEASE_NAMESPACE, self.name, drop)
+        logger.info(f"Released run lease for {self.name}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Automatic matching of source columns to destination columns
+
+Instead of listing every column pair by hand, the plan pairs each writable
+source column with a destination column:
+
+1. an explicit override (the SRC_*/DEST_* column variables, COLUMN_MAP), where
+   an empty target leaves the column out of the sync
+2. otherwise the destination column with the same ID, if its type is compatible
+3. otherwise the only unused destination column with the same title (case and
+   punctuation ignored) and a compatible type
+
+Source columns without a match (or with several equally good ones) are left
+out of the sync instead of being written to a column ID that doesn't exist.
+
+The plan is stored in the state store together with a hash of both boards'
+columns and the overrides, so it is only worked out again when one of the
+schemas or the overrides change.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PLAN_NAMESPACE = "column_plan"
+# Bumped when the matching rules change, so stored plans are worked out again
+PLAN_VERSION = 1
+
+# Columns that are never written (read-only, computed, or the item name)
+UNWRITABLE_TYPES = {"name", "formula", "auto_number", "item_id", "mirror", "lookup",
+                    "creation_log", "last_updated", "subtasks"}
+
+# Type names that refer to the same kind of column
+TYPE_ALIASES = {"numeric": "numbers", "color": "status", "long_text": "long-text"}
+
+
+def parse_column_map(text: str) -> Dict[str, Optional[str]]:
+    """Parse COLUMN_MAP ({"source_col": "dest_col", "unwanted_col": null, ...})"""
+    if not text.strip():
+        return {}
+    try:
+        table = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"COLUMN_MAP is not valid JSON: {e}") from None
+    if not isinstance(table, dict):
+        raise ValueError("COLUMN_MAP must map source column IDs to destination column IDs")
+    return {str(source): str(dest) if dest else None for source, dest in table.items()}
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", (title or "").lower()).split())
+
+
+def compatible(source_type: str, dest_type: str) -> bool:
+    return TYPE_ALIASES.get(source_type, source_type) == TYPE_ALIASES.get(dest_type, dest_type)
+
+
+def schema_key(source_columns: Dict[str, Dict], dest_columns: Dict[str, Dict],
+               overrides: Dict[str, Optional[str]], id_column: str) -> str:
+    """Hash identifying the inputs a plan was worked out from"""
+    def columns(schema: Dict[str, Dict]) -> List[List[str]]:
+        return sorted([col_id, col["title"], col["type"]] for col_id, col in schema.items())
+
+    text = json.dumps([PLAN_VERSION, columns(source_columns), columns(dest_columns), overrides, id_column],
+                      sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def match_columns(source_columns: Dict[str, Dict], dest_columns: Dict[str, Dict],
+                  overrides: Optional[Dict[str, Optional[str]]] = None,
+                  id_column: Optional[str] = None) -> Dict[str, Dict]:
+    """Work out the plan: {"mapping": source ID -> destination ID or None, "reasons": source ID -> how}"""
+    overrides = overrides or {}
+    writable = {col_id: col for col_id, col in source_columns.items() if col["type"] not in UNWRITABLE_TYPES}
+    targets = {col_id: col for col_id, col in dest_columns.items()
+               if col["type"] not in UNWRITABLE_TYPES and col_id != id_column}
+    mapping: Dict[str, Optional[str]] = {}
+    reasons: Dict[str, str] = {}
+
+    for source_id, dest_id in overrides.items():
+        if source_id not in writable:
+            continue
+        if dest_id and dest_id not in dest_columns:
+            logger.warning(f"Column override {source_id} -> {dest_id}: no such destination column; "
+                           f"{source_id} is not synced")
+            dest_id = None
+        mapping[source_id] = dest_id
+        reasons[source_id] = "override" if dest_id else "excluded"
+    taken = {dest_id for dest_id in mapping.values() if dest_id}
+
+    by_title: Dict[str, List[str]] = {}
+    for dest_id, col in targets.items():
+        by_title.setdefault(normalize_title(col["title"]), []).append(dest_id)
+
+    for source_id, col in writable.items():
+        if source_id in mapping:
+            continue
+        if source_id in targets and source_id not in taken and compatible(col["type"], targets[source_id]["type"]):
+            mapping[source_id] = source_id
+            reasons[source_id] = "same id"
+            taken.add(source_id)
+            continue
+        candidates = [dest_id for dest_id in by_title.get(normalize_title(col["title"]), [])
+                      if dest_id not in taken and compatible(col["type"], targets[dest_id]["type"])]
+        if len(candidates) == 1:
+            mapping[source_id] = candidates[0]
+            reasons[source_id] = "same title"
+            taken.add(candidates[0])
+        else:
+            mapping[source_id] = None
+            reasons[source_id] = "ambiguous title" if candidates else "no match"
+    return {"mapping": mapping, "reasons": reasons}
+
+
+class SchemaMatcher:
+    """Column plan for one board pair, cached in the state store by schema hash"""
+
+    def __init__(self, syncer):
+        self.syncer = syncer
+        self.key = f"{syncer.source_board_id}:{syncer.dest_board_id}"
+
+    def plan(self, source_columns: Optional[Dict[str, Dict]] = None, refresh: bool = False) -> Dict[str, Dict]:
+        """The stored plan if both schemas and the overrides are unchanged, otherwise a new one"""
+        syncer = self.syncer
+        if source_columns is None:
+            source_columns = syncer.get_column_mapping(syncer.source_board_id)
+        dest_columns = syncer.get_column_mapping(syncer.dest_board_id)
+        key = schema_key(source_columns, dest_columns, syncer.column_overrides, syncer.source_item_id_column)
+
+        stored = syncer.state.get(PLAN_NAMESPACE, self.key)
+        if stored is not None and stored["schema_key"] == key and not refresh:
+            logger.info(f"Using the stored column plan ({self._summary(stored)})")
+            return stored
+
+        plan = match_columns(source_columns, dest_columns, syncer.column_overrides, syncer.source_item_id_column)
+        plan["schema_key"] = key
+        syncer.state.put(PLAN_NAMESPACE, self.key, plan)
+        logger.info(f"Worked out a new column plan ({self._summary(plan)})")
+        for source_id, dest_id in plan["mapping"].items():
+            title = source_columns[source_id]["title"]
+            if dest_id:
+                logger.info(f"  {source_id} ({title}) -> {dest_id} [{plan['reasons'][source_id]}]")
+            else:
+                logger.warning(f"  {source_id} ({title}) not synced [{plan['reasons'][source_id]}]")
+        return plan
+
+    @staticmethod
+    def _summary(plan: Dict[str, Dict]) -> str:
+        matched = sum(1 for dest_id in plan["mapping"].values() if dest_id)
+        return f"{matched} column(s) matched, {len(plan['mapping']) - matched} not synced"
+
+
+def run_match_columns(syncer, args) -> int:
+    """Show the column plan (working it out again with --refresh)"""
+    plan = SchemaMatcher(syncer).plan(refresh=args.refresh)
+    print(f"\nCOLUMN PLAN ({syncer.source_board_id} -> {syncer.dest_board_id}):")
+    print("-" * 80)
+    for source_id, dest_id in plan["mapping"].items():
+        print(f"  {source_id:<30} -> {dest_id or '(not synced)':<30} [{plan['reasons'][source_id]}]")
+    return 0
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Deterministic partitioning of source items across parallel sync runners
+"""
+
+import glob
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an 'i/N' shard spec (0-based index) into (index, count)"""
+    try:
+        index_text, count_text = spec.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N (e.g. 0/4)") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}', index must be between 0 and {count - 1}")
+    return index, count
+
+
+def shard_of(item_id: str, count: int) -> int:
+    """Shard an item belongs to - stable across processes and Python versions"""
+    digest = hashlib.md5(str(item_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def metrics_path(base_path: str, shard: Optional[Tuple[int, int]]) -> str:
+    """Per-shard metrics file name, e.g. sync_metrics.shard-0-of-4.json"""
+    if shard is None:
+        return base_path
+    root, dot, ext = base_path.rpartition(".")
+    if not dot:
+        root, ext = base_path, "json"
+    return f"{root}.shard-{shard[0]}-of-{shard[1]}.{ext}"
+
+
+def write_metrics(stats: Dict[str, int], path: str, shard: Optional[Tuple[int, int]] = None,
+                  destinations: Optional[Dict[str, Dict[str, int]]] = None) -> None:
+    """Write one run's stats (and per-destination stats of a fan-out run) as a JSON metrics file"""
+    metrics = {
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+        "finished_at": datetime.now().isoformat(),
+        "stats": stats,
+    }
+    if destinations is not None:
+        metrics["destinations"] = destinations
+    with open(path, "w") as f:
+        json.dump(metrics, f, indent=2)
+    logger.info(f"Wrote sync metrics to {path}")
+
+
+def merge_metrics(patterns: List[str], output_path: str) -> Dict[str, int]:
+    """Aggregate per-shard metrics files into one set of totals"""
+    paths = sorted({path for pattern in patterns for path in glob.glob(pattern)} - {output_path})
+    if not paths:
+        raise ValueError(f"No metrics files match {patterns}")
+
+    totals: Dict[str, int] = {}
+    shards = []
+    for path in paths:
+        with open(path) as f:
+            metrics = json.load(f)
+        shards.append(metrics.get("shard"))
+        for key, value in metrics["stats"].items():
+            totals[key] = totals.get(key, 0) + value
+
+    merged = {
+        "shards": shards,
+        "finished_at": datetime.now().isoformat(),
+        "stats": totals,
+    }
+    with open(output_path, "w") as f:
+        json.dump(merged, f, indent=2)
+
+    logger.info(f"Merged metrics from {len(paths)} shard(s) into {output_path}: {totals}")
+    return totals
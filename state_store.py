@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Local state store for data that has to survive between sync runs
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StateStore:
+    """Small SQLite-backed key/value store, namespaced per feature"""
+
+    def __init__(self, path: str = "sync_state.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS state (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def get(self, namespace: str, key: str, default: Any = None, max_age: Optional[float] = None) -> Any:
+        """Return a stored value, or default if missing or older than max_age seconds"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+        if row is None:
+            return default
+        if max_age is not None and time.time() - row[1] > max_age:
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Any]:
+        """Return the stored values for those of these keys that exist"""
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's limit on query parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT key, value FROM state WHERE namespace = ? AND key IN (%s)" % ", ".join("?" * len(chunk)),
+                    [namespace, *chunk]
+                ).fetchall()
+                found.update({key: json.loads(value) for key, value in rows})
+        return found
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value"""
+        self.put_many(namespace, {key: value})
+
+    def put_many(self, namespace: str, entries: Dict[str, Any]) -> None:
+        """Store several values in one transaction"""
+        now = time.time()
+        rows = [(namespace, key, json.dumps(value), now) for key, value in entries.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def update(self, namespace: str, key: str, change: Callable[[Any], Any]) -> Any:
+        """Replace a value with change(current value or None) atomically, also across processes
+
+        Returns the value that is stored afterwards.
+        """
+        with self._lock:
+            # Take the write lock before reading so no other process can interleave
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                value = change(json.loads(row[0]) if row else None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, json.dumps(value), time.time())
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return value
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a single key"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def delete_many(self, namespace: str, keys: List[str]) -> None:
+        """Remove several keys in one transaction"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM state WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys]
+            )
+
+    def clear(self, namespace: str) -> None:
+        """Remove every key in a namespace"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state WHERE namespace = ?", (namespace,))
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Return all key/value pairs in a namespace"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM state WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Pipelined sync: fetch -> transform -> write stages connected by bounded queues
+
+Source pages stream into the transform stage while later pages are still being
+fetched, and transformed items are written while the next ones are transformed.
+Bounded queues give backpressure: a slow writer stalls the fetcher instead of
+buffering the whole board in memory.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+from board_model import BoardSchema
+from dead_letter import CircuitOpenError
+from transform_pool import TransformPool
+from work_scheduler import WorkItem, WorkScheduler
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How often blocked stages wake up to check whether the run was stopped
+_POLL_SECONDS = 0.5
+
+
+class SyncPipeline:
+    """Streams one board pair through fetch, transform and write stages"""
+
+    def __init__(self, syncer, scheduler: WorkScheduler, columns_info: Dict, stats: Dict[str, int]):
+        self.syncer = syncer
+        self.scheduler = scheduler
+        self.columns_info = columns_info
+        self.stats = stats
+
+        # Pages of source items waiting to be transformed
+        self.page_queue: queue.Queue = queue.Queue(maxsize=syncer.pipeline_queue_pages)
+        # Transformed jobs waiting to be written, highest priority first among those buffered
+        self.write_queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=syncer.pipeline_queue_items)
+        self._sequence = itertools.count()
+
+        self.dest_lookup: Dict[str, Any] = {}
+        self.dest_ready = threading.Event()
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+
+    def _fail(self, error: BaseException) -> None:
+        self.errors.append(error)
+        self.stop.set()
+
+    def _put(self, target: queue.Queue, entry: Any) -> bool:
+        """Blocking put that gives up once the pipeline is stopped"""
+        while not self.stop.is_set():
+            try:
+                target.put(entry, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Blocking get that returns _DONE once the pipeline is stopped"""
+        while not self.stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fetch_dest(self) -> None:
+        """Stage: index the destination board by source_item_id"""
+        if self.syncer.warm_dest_lookup is not None:
+            self.dest_lookup = self.syncer.warm_dest_lookup
+            self.dest_ready.set()
+            return
+        try:
+            schema = BoardSchema() if self.syncer.compact_items else None
+            count = 0
+            for page in self.syncer.iter_board_item_pages(self.syncer.dest_board_id):
+                if self.stop.is_set():
+                    return
+                if schema is not None:
+                    page = [schema.compact(item) for item in page]
+                self.syncer._index_dest_items(page, self.dest_lookup)
+                count += len(page)
+            logger.info(f"Indexed {count} destination items ({len(self.dest_lookup)} with source_item_id populated)")
+        except Exception as e:
+            logger.error(f"Destination fetch failed: {e}")
+            self._fail(e)
+        finally:
+            self.dest_ready.set()
+
+    def _fetch_source(self) -> None:
+        """Stage: stream source pages into the transform queue"""
+        try:
+            schema = BoardSchema() if self.syncer.compact_items else None
+            remaining = self.syncer.item_limit or None
+            for page in self.syncer.iter_board_item_pages(self.syncer.source_board_id,
+                                                          query_params=self.syncer.source_filter):
+                if schema is not None:
+                    page = [schema.compact(item) for item in page]
+                page = [item for item in page if self.syncer._in_shard(item)]
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                self.syncer._export_page(page)
+                if page and not self._put(self.page_queue, page):
+                    return
+                if remaining == 0:
+                    break
+        except Exception as e:
+            logger.error(f"Source fetch failed: {e}")
+            self._fail(e)
+        finally:
+            self._put(self.page_queue, _DONE)
+
+    def _transform(self) -> None:
+        """Stage: build payloads, classify against the destination index and queue writes"""
+        carried_over = self.syncer._carried_over_ids()
+        pool = TransformPool(self.syncer, self.syncer.transform_workers, self.syncer.transform_chunk_size)
+        use_processes = self.syncer.transform_workers > 0
+        try:
+            # Keep worker processes up for the whole run rather than starting them per page
+            with pool if use_processes else nullcontext():
+                while True:
+                    page = self._get(self.page_queue)
+                    if page is _DONE:
+                        break
+
+                    # Payloads can only link to destination copies once those are known
+                    if self.syncer.link_translator is not None and self.syncer.link_translator.wanted(page):
+                        self.dest_ready.wait()
+                        self.syncer._resolve_links(page, self.dest_lookup)
+
+                    results = pool.transform(page) if use_processes else pool.transform_in_process(page)
+
+                    # Create vs update needs the full destination index
+                    self.dest_ready.wait()
+                    if self.stop.is_set():
+                        break
+                    # Labels only get created for pages that use new ones
+                    self.syncer._provision_labels(page, self.stats)
+
+                    for item in page:
+                        job = self.syncer._classify(item, self.dest_lookup, carried_over)
+                        job.payload, job.fingerprint, job.transform_error = results[item["id"]]
+                        entry = (job.priority, not job.carried_over, next(self._sequence), job)
+                        if not self._put(self.write_queue, entry):
+                            return
+        except Exception as e:
+            logger.error(f"Transform stage failed: {e}")
+            self._fail(e)
+        finally:
+            self._put(self.write_queue, (float("inf"), True, next(self._sequence), _DONE))
+
+    def _drain_unfinished(self) -> List[str]:
+        """Source IDs still sitting in the queues after an early stop"""
+        unfinished = []
+        while True:
+            try:
+                page = self.page_queue.get_nowait()
+            except queue.Empty:
+                break
+            if page is not _DONE:
+                unfinished.extend(item["id"] for item in page)
+        while True:
+            try:
+                job = self.write_queue.get_nowait()[3]
+            except queue.Empty:
+                break
+            if job is not _DONE:
+                unfinished.append(job.source_id)
+        return unfinished
+
+    def run(self) -> List[str]:
+        """Run all stages; the write stage runs on the calling thread. Returns unfinished source IDs"""
+        logger.info(f"Streaming {self.syncer.source_board_id} -> {self.syncer.dest_board_id} "
+                    f"(queues: {self.page_queue.maxsize} pages, {self.write_queue.maxsize} items)")
+        started = time.monotonic()
+        threads = [
+            threading.Thread(target=self._fetch_dest, name="fetch-dest", daemon=True),
+            threading.Thread(target=self._fetch_source, name="fetch-source", daemon=True),
+            threading.Thread(target=self._transform, name="transform", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        unfinished: List[str] = []
+        try:
+            self._write(unfinished, started)
+        finally:
+            # Also stops the other stages when a write aborts the run
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+            unfinished.extend(self._drain_unfinished())
+
+        if self.errors:
+            raise self.errors[0]
+
+        if unfinished:
+            logger.warning(f"{len(unfinished)} queued item(s) carried over to the next run")
+        return unfinished
+
+    def _write(self, unfinished: List[str], started: float) -> None:
+        """Stage: write queued jobs in priority order until done, out of budget or out of time"""
+        first_write: Optional[float] = None
+        while True:
+            entry = self._get(self.write_queue)
+            if entry is _DONE or entry[3] is _DONE:
+                break
+            job: WorkItem = entry[3]
+
+            action, wait_seconds, reason = self.scheduler.next_action(
+                self.syncer.complexity_remaining, self.syncer.complexity_reset_in
+            )
+            while action == "wait":
+                logger.info(f"Waiting {wait_seconds:.0f}s for complexity budget reset: {reason}")
+                time.sleep(wait_seconds)
+                self.syncer.complexity_remaining = None
+                action, wait_seconds, reason = self.scheduler.next_action(None, None)
+            if action == "stop":
+                logger.warning(f"Stopping early: {reason}")
+                unfinished.append(job.source_id)
+                self.stop.set()
+                break
+
+            if first_write is None:
+                first_write = time.monotonic() - started
+                logger.info(f"First write {first_write:.1f}s after start")
+            try:
+                self.syncer._sync_item(job, self.columns_info, self.stats)
+            except CircuitOpenError as e:
+                # Filled up with the queued jobs once the other stages have stopped
+                unfinished.append(job.source_id)
+                e.unfinished = unfinished
+                raise
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Optional process-pool stage for the CPU-bound part of a sync
+
+Turns chunks of source items into ready-to-send column value payloads and
+fingerprints in worker processes, so very wide boards aren't limited to one core.
+"""
+
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Below this many items per chunk, pickling and IPC cost more than the transform itself
+MIN_CHUNK_SIZE = 50
+# Chunks per worker - enough to balance uneven chunks without flooding the pool with tiny tasks
+CHUNKS_PER_WORKER = 4
+
+# (payload JSON, fingerprint, error message) per source item ID
+TransformResult = Tuple[Optional[str], Optional[str], Optional[str]]
+
+# Per-process syncer used by worker processes (set by _init_worker)
+_worker_syncer = None
+
+
+def _init_worker(source_item_id_column: str, column_id_mapping: Dict[str, str], src_completion_col: str,
+                 directory: Optional[Dict[str, List[Dict]]] = None) -> None:
+    """Build a network-free MondaySync in each worker for its transform logic"""
+    global _worker_syncer
+    from monday_sync import MondaySync
+
+    syncer = MondaySync("", "", "", source_item_id_column)
+    syncer.column_id_mapping = column_id_mapping
+    syncer.src_completion_col = src_completion_col
+    # The people directory is fetched by the parent and handed over, never fetched by workers
+    if syncer.people_directory is not None:
+        syncer.people_directory.load(directory)
+    _worker_syncer = syncer
+
+
+def _transform_chunk(task: Tuple[List[Any], Dict[str, str]]) -> List[Tuple[str, TransformResult]]:
+    """Transform one chunk of items in a worker process
+
+    The chunk comes with the part of the linked-item index its link columns need.
+    """
+    items, linked_ids = task
+    _worker_syncer.link_translator.preload(linked_ids)
+    results = []
+    for item in items:
+        try:
+            payload, fingerprint = _worker_syncer.build_payload(item, {})
+            results.append((item["id"], (payload, fingerprint, None)))
+        except Exception as e:
+            results.append((item["id"], (None, None, str(e))))
+    return results
+
+
+def chunk_size_for(item_count: int, workers: int, configured: Optional[int] = None) -> int:
+    """Items per task, large enough that IPC overhead doesn't dominate"""
+    if configured:
+        return configured
+    return max(MIN_CHUNK_SIZE, math.ceil(item_count / (workers * CHUNKS_PER_WORKER)))
+
+
+class TransformPool:
+    """Runs build_payload for many items across worker processes
+
+    Used as a context manager, the worker processes stay up across transform() calls
+    (e.g. one call per page in the pipeline); otherwise each call starts its own pool.
+    """
+
+    def __init__(self, syncer, workers: int, chunk_size: Optional[int] = None):
+        self.syncer = syncer
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        directory = self.syncer.people_directory.snapshot() if self.syncer.people_directory is not None else None
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.syncer.source_item_id_column, self.syncer.column_id_mapping, self.syncer.src_completion_col,
+                      directory)
+        )
+
+    def __enter__(self) -> "TransformPool":
+        self._executor = self._new_executor()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._executor.shutdown()
+        self._executor = None
+
+    def transform(self, items: List[Any]) -> Dict[str, TransformResult]:
+        """Payload, fingerprint and error (if any) for each item, keyed by item ID"""
+        chunk_size = chunk_size_for(len(items), self.workers, self.chunk_size)
+
+        # A single chunk isn't worth starting processes for
+        if len(items) <= chunk_size:
+            return self.transform_in_process(items)
+
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        translator = self.syncer.link_translator
+        tasks = [(chunk, translator.subset(chunk) if translator is not None else {}) for chunk in chunks]
+        logger.info(f"Transforming {len(items)} items in {len(chunks)} chunks of {chunk_size} across {self.workers} processes")
+
+        results: Dict[str, TransformResult] = {}
+        if self._executor is not None:
+            for chunk_results in self._executor.map(_transform_chunk, tasks):
+                results.update(chunk_results)
+            return results
+
+        with self._new_executor() as pool:
+            for chunk_results in pool.map(_transform_chunk, tasks):
+                results.update(chunk_results)
+        return results
+
+    def transform_in_process(self, items: List[Any]) -> Dict[str, TransformResult]:
+        """Same as transform(), without worker processes"""
+        results = {}
+        for item in items:
+            try:
+                payload, fingerprint = self.syncer.build_payload(item, {})
+                results[item["id"]] = (payload, fingerprint, None)
+            except Exception as e:
+                results[item["id"]] = (None, None, str(e))
+        return results
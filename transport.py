@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTTP transport for GraphQL requests, with optional record/replay of exchanges
+
+Recording writes each request/response pair to a JSON Lines cassette with secrets
+scrubbed. Replaying serves responses from a cassette without any network access,
+matching requests by normalized query text and variables, which makes sync runs
+repeatable for profiling and benchmarking.
+"""
+
+import json
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+SCRUBBED = "<scrubbed>"
+
+# Keys whose values are replaced before anything is written to a cassette
+SECRET_KEYS = {"authorization", "api_token", "token", "password", "secret", "public_url"}
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed request has no recorded response"""
+
+
+def normalize_query(query: str) -> str:
+    """Query text with insignificant whitespace collapsed"""
+    return " ".join(query.split())
+
+
+def request_key(payload: Dict) -> Tuple[str, str]:
+    """Key a request is matched on during replay: (normalized query, canonical variables)"""
+    variables = json.dumps(payload.get("variables") or {}, sort_keys=True)
+    return normalize_query(payload["query"]), variables
+
+
+def scrub(value: Any, secrets: List[str]) -> Any:
+    """Copy of value with secret keys and literal secret strings replaced"""
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if key.lower() in SECRET_KEYS else scrub(item, secrets)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item, secrets) for item in value]
+    if isinstance(value, str):
+        for secret in secrets:
+            value = value.replace(secret, SCRUBBED)
+    return value
+
+
+class HttpTransport:
+    """Sends GraphQL payloads over a shared requests session"""
+
+    def __init__(self, api_url: str, session: requests.Session, rate_limiter: RateLimiter):
+        self.api_url = api_url
+        self.session = session
+        self.rate_limiter = rate_limiter
+
+    def post(self, payload: Dict) -> Dict:
+        self.rate_limiter.acquire()
+        response = self.session.post(self.api_url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+class RecordingTransport:
+    """Forwards requests to another transport and appends each exchange to a cassette"""
+
+    def __init__(self, inner: HttpTransport, path: str, secrets: Optional[List[str]] = None):
+        self.inner = inner
+        self.path = path
+        self.secrets = [secret for secret in (secrets or []) if secret]
+        self._lock = threading.Lock()
+        # Start a fresh cassette for each recording
+        open(path, "w").close()
+        logger.info(f"Recording API exchanges to {path}")
+
+    def post(self, payload: Dict) -> Dict:
+        result = self.inner.post(payload)
+        entry = {"request": scrub(payload, self.secrets), "response": scrub(result, self.secrets)}
+        line = json.dumps(entry)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+        return result
+
+
+class ReplayTransport:
+    """Serves recorded responses without touching the network
+
+    Requests are matched on query and variables. With loose=True, a request whose
+    variables don't match falls back to the query text alone, so runs whose payloads
+    changed (e.g. when benchmarking a transform change) can still be replayed; every
+    such fallback is logged and counted. Repeated identical requests get the
+    recorded responses in order, and the last one is reused once they run out.
+    """
+
+    def __init__(self, path: str, loose: bool = False):
+        self.path = path
+        self.loose = loose
+        # Requests answered by the query-only fallback
+        self.loose_matches = 0
+        self._lock = threading.Lock()
+        self._exact: Dict[Tuple[str, str], Deque[Dict]] = defaultdict(deque)
+        self._by_query: Dict[str, Deque[Dict]] = defaultdict(deque)
+        count = 0
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = request_key(entry["request"])
+                self._exact[key].append(entry["response"])
+                self._by_query[key[0]].append(entry["response"])
+                count += 1
+        logger.info(f"Replaying {count} recorded API exchanges from {path}")
+
+    @staticmethod
+    def _take(responses: Deque[Dict]) -> Dict:
+        return responses.popleft() if len(responses) > 1 else responses[0]
+
+    def post(self, payload: Dict) -> Dict:
+        key = request_key(payload)
+        with self._lock:
+            if self._exact.get(key):
+                return self._take(self._exact[key])
+            if self._by_query.get(key[0]):
+                if not self.loose:
+                    raise CassetteMissError(
+                        f"Variables differ from every recording in {self.path} of query: {key[0][:120]} "
+                        f"(--replay-loose falls back to matching the query alone)"
+                    )
+                self.loose_matches += 1
+                logger.warning(f"Replay: variables differ, served a response recorded for other variables "
+                               f"({self.loose_matches} so far) for query: {key[0][:120]}")
+                return self._take(self._by_query[key[0]])
+        raise CassetteMissError(f"No recorded response in {self.path} for query: {key[0][:120]}")
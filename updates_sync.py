@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Incremental replication of item updates (comments) to the destination copies
+
+Each run reads the source board's updates newest first and stops at the board's
+cursor (the creation time of the newest update seen by the previous run), so
+only new updates are transferred. Updates are posted to the destination copy of
+their item as batched create_update mutations, oldest first. The original author
+and time go in a header line, since the API token's user is shown as the poster.
+
+Posted update IDs are kept in the state store, so nothing is posted twice. An
+update that can't be posted yet (its item has no copy yet, the post failed, or
+the run ran out of time) marks its item as pending. Pending items have all their
+updates re-read in bulk on the following runs until they are caught up, or
+until PENDING_MAX_AGE_SECONDS has passed. Updates of items outside this runner's
+shard are ignored, and so are those of items outside SOURCE_ITEMS_FILTER, which
+never get a copy.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from work_scheduler import WorkScheduler
+
+logger = logging.getLogger(__name__)
+
+# Updates per page of the board updates query
+PAGE_SIZE = 100
+# create_update mutations per request
+DEFAULT_BATCH_SIZE = 20
+# Items per items(ids:) query for pending items
+ITEMS_CHUNK_SIZE = 50
+# Pending items whose updates still can't be posted after this long are given up on
+PENDING_MAX_AGE_SECONDS = 30 * 86400
+
+UPDATE_FIELDS = """
+                id
+                item_id
+                body
+                created_at
+                creator {
+                    name
+                }
+"""
+
+
+class UpdatesSync:
+    """Copies new updates of source items to their destination copies"""
+
+    def __init__(self, syncer, batch_size: int = DEFAULT_BATCH_SIZE, since: Optional[str] = None,
+                 scheduler: Optional[WorkScheduler] = None):
+        self.syncer = syncer
+        self.batch_size = max(batch_size, 1)
+        # Oldest update to copy on the first run (ISO timestamp; None = all)
+        self.since = since
+        self.scheduler = scheduler
+        pair = syncer._pair_key()
+        self.cursor_key = pair
+        self.posted_namespace = f"updates_posted:{pair}"
+        self.pending_namespace = f"updates_pending:{pair}"
+
+    def fetch_new(self, cursor: Optional[str]) -> List[Dict]:
+        """Board updates created at or after the cursor (newest first)"""
+        query = """
+        query ($boardId: [ID!], $limit: Int!, $page: Int!) {
+            boards(ids: $boardId) {
+                updates(limit: $limit, page: $page) {%s}
+            }
+        }
+        """ % UPDATE_FIELDS
+        updates: List[Dict] = []
+        page = 1
+        while True:
+            result = self.syncer._execute_query(
+                query, {"boardId": self.syncer.source_board_id, "limit": PAGE_SIZE, "page": page}
+            )
+            boards = result.get("data", {}).get("boards") or []
+            batch = boards[0]["updates"] if boards else []
+            fresh = [update for update in batch if not cursor or update["created_at"] >= cursor]
+            updates.extend(fresh)
+            if len(batch) < PAGE_SIZE or len(fresh) < len(batch):
+                return updates
+            page += 1
+
+    def fetch_items(self, item_ids: List[str]) -> List[Dict]:
+        """All updates of specific items (pending ones), in bulk"""
+        query = """
+        query ($itemIds: [ID!]) {
+            items(ids: $itemIds) {
+                id
+                updates {%s}
+            }
+        }
+        """ % UPDATE_FIELDS
+        updates: List[Dict] = []
+        for start in range(0, len(item_ids), ITEMS_CHUNK_SIZE):
+            result = self.syncer._execute_query(query, {"itemIds": item_ids[start:start + ITEMS_CHUNK_SIZE]})
+            for item in result.get("data", {}).get("items") or []:
+                for update in item.get("updates") or []:
+                    updates.append(dict(update, item_id=update.get("item_id") or item["id"]))
+        return updates
+
+    def in_filter(self, item_ids: List[str]) -> Set[str]:
+        """Those of these source items that match SOURCE_ITEMS_FILTER"""
+        matching: Set[str] = set()
+        for start in range(0, len(item_ids), ITEMS_CHUNK_SIZE):
+            query_params = dict(self.syncer.source_filter, ids=item_ids[start:start + ITEMS_CHUNK_SIZE])
+            for page in self.syncer.iter_board_item_pages(self.syncer.source_board_id, query_params=query_params):
+                matching.update(str(item["id"]) for item in page)
+        return matching
+
+    @staticmethod
+    def body(update: Dict) -> str:
+        """Update text with the original author and time, which the API can't set"""
+        author = (update.get("creator") or {}).get("name") or "Unknown"
+        return f"<p><em>{author} - {update['created_at']}</em></p>{update.get('body') or ''}"
+
+    def post_batch(self, batch: List[Dict], copies: Dict[str, str]) -> Dict[str, str]:
+        """Post updates with one aliased mutation; returns source update ID -> destination update ID"""
+        definitions = []
+        fields = []
+        variables: Dict[str, Any] = {}
+        for position, update in enumerate(batch):
+            definitions += [f"$item{position}: ID!", f"$body{position}: String!"]
+            variables[f"item{position}"] = copies[str(update["item_id"])]
+            variables[f"body{position}"] = self.body(update)
+            fields.append(f"u{position}: create_update(item_id: $item{position}, body: $body{position}) {{ id }}")
+        query = "mutation (%s) {\n    %s\n}" % (", ".join(definitions), "\n    ".join(fields))
+        data = self.syncer._execute_query(query, variables).get("data") or {}
+        return {
+            str(update["id"]): str(data[f"u{position}"]["id"])
+            for position, update in enumerate(batch) if data.get(f"u{position}")
+        }
+
+    def _out_of_time(self) -> bool:
+        if self.scheduler is None:
+            return False
+        action, _, reason = self.scheduler.next_action(self.syncer.complexity_remaining,
+                                                       self.syncer.complexity_reset_in)
+        if action == "stop":
+            logger.warning(f"Stopping updates sync early: {reason}")
+            return True
+        return False
+
+    def run(self) -> Dict[str, int]:
+        syncer = self.syncer
+        state = syncer.state
+        stats = {"updates_posted": 0, "updates_already_posted": 0, "updates_pending": 0, "updates_skipped": 0,
+                 "update_errors": 0}
+
+        cursor = state.get("updates_cursor", self.cursor_key) or self.since
+        updates = self.fetch_new(cursor)
+        pending = state.items(self.pending_namespace)
+        if pending:
+            updates += self.fetch_items(sorted(pending))
+        # Other shards copy the updates of their own items
+        updates = [update for update in updates if syncer._in_shard({"id": str(update["item_id"])})]
+
+        posted = state.get_many(self.posted_namespace, [str(update["id"]) for update in updates])
+        todo: Dict[str, Dict] = {}
+        for update in updates:
+            update_id = str(update["id"])
+            if update_id in posted:
+                stats["updates_already_posted"] += 1
+            elif not self.since or update["created_at"] >= self.since:
+                todo[update_id] = update
+        # Oldest first, so the destination shows them in the same order
+        ordered = sorted(todo.values(), key=lambda update: update["created_at"])
+        logger.info(f"{len(ordered)} new update(s) to copy ({len(pending)} pending item(s) rechecked)")
+
+        copies = syncer.link_translator.copies(
+            {str(update["item_id"]) for update in ordered}, board_id=syncer.source_board_id
+        ) if ordered else {}
+
+        uncopied = sorted({str(update["item_id"]) for update in ordered} - copies.keys())
+        if uncopied and syncer.source_filter:
+            # Items outside the filter never get a copy, so there is nothing to wait for
+            excluded = set(uncopied) - self.in_filter(uncopied)
+            if excluded:
+                ordered = [update for update in ordered if str(update["item_id"]) not in excluded]
+                stats["updates_skipped"] = len(todo) - len(ordered)
+
+        unposted_items = set()
+        ready = []
+        for update in ordered:
+            if str(update["item_id"]) in copies:
+                ready.append(update)
+            else:
+                unposted_items.add(str(update["item_id"]))
+
+        for start in range(0, len(ready), self.batch_size):
+            batch = ready[start:start + self.batch_size]
+            if self._out_of_time():
+                unposted_items.update(str(update["item_id"]) for update in ready[start:])
+                break
+            try:
+                done = self.post_batch(batch, copies)
+            except Exception as e:
+                logger.error(f"Posting {len(batch)} update(s) failed: {e}")
+                done = {}
+            state.put_many(self.posted_namespace, done)
+            stats["updates_posted"] += len(done)
+            failed = [update for update in batch if str(update["id"]) not in done]
+            stats["update_errors"] += len(failed)
+            unposted_items.update(str(update["item_id"]) for update in failed)
+
+        # Pending items are caught up once all their updates are posted
+        now = time.time()
+        caught_up = [item_id for item_id in pending if item_id not in unposted_items]
+        expired = [item_id for item_id in unposted_items
+                   if now - pending.get(item_id, now) > PENDING_MAX_AGE_SECONDS]
+        if expired:
+            logger.warning(f"Giving up on updates of {len(expired)} item(s) that still can't be posted")
+        state.delete_many(self.pending_namespace, caught_up + expired)
+        state.put_many(self.pending_namespace, {
+            item_id: pending.get(item_id, now) for item_id in unposted_items if item_id not in expired
+        })
+        stats["updates_pending"] = len(unposted_items) - len(expired)
+
+        # The cursor moves on regardless; anything left behind is tracked per item
+        newest = max((update["created_at"] for update in updates), default=None)
+        if newest and (not cursor or newest > cursor):
+            state.put("updates_cursor", self.cursor_key, newest)
+
+        logger.info(f"Updates sync finished: {stats}")
+        return stats
+
+
+def run_updates(syncer, args) -> int:
+    """Copy new item updates (comments) to the destination copies"""
+    scheduler = WorkScheduler(deadline_seconds=syncer.deadline_seconds, complexity_reserve=syncer.complexity_reserve,
+                              stop_event=syncer.lease_lost)
+    stats = UpdatesSync(syncer, args.batch_size, since=args.since, scheduler=scheduler).run()
+    return 1 if stats["update_errors"] else 0
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Checksum-based verification that the destination board matches the source board
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from board_model import BoardSchema, column_text
+
+logger = logging.getLogger(__name__)
+
+# How many examples of each problem to print
+REPORT_EXAMPLES = 20
+
+
+def checksum(value: Any) -> str:
+    """Stable checksum of a normalized column value"""
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def item_checksum(column_checksums: Dict[str, str]) -> str:
+    """Checksum of a whole item from its per-column checksums"""
+    joined = "|".join(f"{col_id}={column_checksums[col_id]}" for col_id in sorted(column_checksums))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class VerifyReport:
+    """Result of comparing a source board with its destination copy"""
+    source_items: int = 0
+    dest_items: int = 0
+    matched: int = 0
+    # (source_id, dest_id, [differing dest column IDs])
+    mismatches: List[Tuple[str, str, List[str]]] = field(default_factory=list)
+    # Source items with no destination copy
+    missing: List[str] = field(default_factory=list)
+    # source_id -> destination item IDs sharing it
+    duplicates: Dict[str, List[str]] = field(default_factory=dict)
+    # Destination items whose source item no longer exists
+    orphans: List[str] = field(default_factory=list)
+    # Destination items with an empty source_item_id column
+    unmapped: List[str] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.mismatches or self.missing or self.duplicates or self.orphans or self.unmapped)
+
+    def to_dict(self) -> Dict:
+        return {
+            "source_items": self.source_items,
+            "dest_items": self.dest_items,
+            "matched": self.matched,
+            "mismatches": [
+                {"source_item_id": src, "dest_item_id": dest, "columns": cols}
+                for src, dest, cols in self.mismatches
+            ],
+            "missing": self.missing,
+            "duplicates": self.duplicates,
+            "orphans": self.orphans,
+            "unmapped": self.unmapped,
+        }
+
+    def log_summary(self) -> None:
+        logger.info("=" * 60)
+        logger.info(f"Source items: {self.source_items}, destination items: {self.dest_items}")
+        logger.info(f"Matching: {self.matched}")
+        logger.info(f"Column mismatches: {len(self.mismatches)}")
+        for src, dest, cols in self.mismatches[:REPORT_EXAMPLES]:
+            logger.info(f"  source {src} -> dest {dest}: {', '.join(cols)}")
+        logger.info(f"Missing on destination: {len(self.missing)}")
+        for src in self.missing[:REPORT_EXAMPLES]:
+            logger.info(f"  source {src}")
+        logger.info(f"Duplicated source IDs: {len(self.duplicates)}")
+        for src, dests in list(self.duplicates.items())[:REPORT_EXAMPLES]:
+            logger.info(f"  source {src} -> dest {', '.join(dests)}")
+        logger.info(f"Orphaned destination items: {len(self.orphans)}")
+        logger.info(f"Destination items without source_item_id: {len(self.unmapped)}")
+        logger.info("Result: " + ("DRIFT DETECTED" if self.has_drift else "boards in sync"))
+        logger.info("=" * 60)
+
+
+class BoardVerifier:
+    """Streams both boards in parallel and compares per-column checksums"""
+
+    def __init__(self, syncer, ignore_columns: Optional[List[str]] = None):
+        self.syncer = syncer
+        self.ignore_columns = set(ignore_columns or [])
+        self.ignore_columns.add(syncer.source_item_id_column)
+
+    def _column_checksums(self, item: Any, column_id_mapping: Dict[str, str]) -> Dict[str, str]:
+        """Per-column checksums under the same normalization the sync writes with"""
+        values = self.syncer.prepare_column_values(item, {}, column_id_mapping, verbose=False)
+        return {
+            col_id: checksum(value)
+            for col_id, value in values.items()
+            if col_id not in self.ignore_columns
+        }
+
+    def _stream(self, board_id: str, handle_page: Callable[[List[Any]], None], errors: List[BaseException],
+                query_params: Optional[Dict] = None) -> None:
+        try:
+            schema = BoardSchema() if self.syncer.compact_items else None
+            for page in self.syncer.iter_board_item_pages(board_id, query_params=query_params):
+                if schema is not None:
+                    page = [schema.compact(item) for item in page]
+                handle_page(page)
+        except Exception as e:
+            logger.error(f"Fetching board {board_id} failed: {e}")
+            errors.append(e)
+
+    def run(self) -> VerifyReport:
+        """Fetch both boards concurrently and report drift"""
+        source: Dict[str, Dict[str, str]] = {}
+        dest: Dict[str, List[Tuple[str, Dict[str, str]]]] = {}
+        unmapped: List[str] = []
+        errors: List[BaseException] = []
+
+        def handle_source_page(page: List[Any]) -> None:
+            for item in page:
+                source[item["id"]] = self._column_checksums(item, self.syncer.column_id_mapping)
+
+        def handle_dest_page(page: List[Any]) -> None:
+            for item in page:
+                source_id = column_text(item, self.syncer.source_item_id_column)
+                if not source_id:
+                    unmapped.append(item["id"])
+                    continue
+                dest.setdefault(source_id, []).append((item["id"], self._column_checksums(item, {})))
+
+        threads = [
+            threading.Thread(target=self._stream, args=(self.syncer.source_board_id, handle_source_page, errors,
+                                                        self.syncer.source_filter)),
+            threading.Thread(target=self._stream, args=(self.syncer.dest_board_id, handle_dest_page, errors)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        report = VerifyReport(
+            source_items=len(source),
+            dest_items=sum(len(copies) for copies in dest.values()) + len(unmapped),
+            unmapped=unmapped,
+        )
+        for source_id, src_checksums in source.items():
+            copies = dest.get(source_id)
+            if not copies:
+                report.missing.append(source_id)
+                continue
+            if len(copies) > 1:
+                report.duplicates[source_id] = [dest_id for dest_id, _ in copies]
+
+            for dest_id, dest_checksums in copies:
+                # Only columns the sync writes are compared; extra destination columns are ignored
+                dest_checksums = {col_id: dest_checksums.get(col_id) for col_id in src_checksums}
+                if item_checksum(src_checksums) == item_checksum(dest_checksums):
+                    report.matched += 1
+                    continue
+                differing = sorted(
+                    col_id for col_id in src_checksums
+                    if src_checksums[col_id] != dest_checksums[col_id]
+                )
+                report.mismatches.append((source_id, dest_id, differing))
+
+        # With a source filter, destination items outside the filter aren't orphans
+        if not self.syncer.source_filter:
+            report.orphans = [
+                dest_id
+                for source_id, copies in dest.items() if source_id not in source
+                for dest_id, _ in copies
+            ]
+        return report
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Priority- and budget-aware ordering of destination board writes
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower value = written first
+PRIORITY_NEW = 0
+PRIORITY_STATUS_CHANGED = 1
+PRIORITY_OTHER = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_NEW: "new",
+    PRIORITY_STATUS_CHANGED: "status_changed",
+    PRIORITY_OTHER: "other",
+}
+
+
+@dataclass
+class WorkItem:
+    """A pending write for one source item"""
+    source_item: Dict
+    dest_item_id: Optional[str]
+    priority: int
+    carried_over: bool = False
+    # Filled in by the transform stage
+    payload: Optional[str] = None
+    fingerprint: Optional[str] = None
+    transform_error: Optional[str] = None
+
+    @property
+    def source_id(self) -> str:
+        return self.source_item["id"]
+
+
+class WorkScheduler:
+    """Orders pending writes by priority and stops before the budget or deadline runs out"""
+
+    def __init__(
+        self,
+        deadline_seconds: Optional[float] = None,
+        complexity_reserve: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        stop_event: Optional[threading.Event] = None
+    ):
+        self.clock = clock
+        self.started_at = clock()
+        self.deadline = self.started_at + deadline_seconds if deadline_seconds else None
+        self.complexity_reserve = complexity_reserve
+        # Set from outside (e.g. when the run lease is lost) to stop writing
+        self.stop_event = stop_event
+
+    def order(self, work: Iterable[WorkItem]) -> List[WorkItem]:
+        """Sort work by priority; within a priority, carried-over items go first, then API order"""
+        indexed = list(enumerate(work))
+        indexed.sort(key=lambda pair: (pair[1].priority, not pair[1].carried_over, pair[0]))
+        ordered = [job for _, job in indexed]
+
+        counts = {name: 0 for name in PRIORITY_NAMES.values()}
+        for job in ordered:
+            counts[PRIORITY_NAMES.get(job.priority, "other")] += 1
+        carried = sum(1 for job in ordered if job.carried_over)
+        logger.info(f"Scheduled {len(ordered)} writes: {counts} ({carried} carried over from previous run)")
+        return ordered
+
+    def seconds_left(self) -> Optional[float]:
+        """Seconds until the deadline, or None when there is no deadline"""
+        if self.deadline is None:
+            return None
+        return self.deadline - self.clock()
+
+    def next_action(self, complexity_remaining: Optional[int], reset_in_seconds: Optional[float]) -> Tuple[str, float, str]:
+        """Decide whether to write the next item
+
+        Returns one of ("continue", 0, ""), ("wait", seconds, reason) or ("stop", 0, reason).
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            return "stop", 0, "run lease lost to another process"
+
+        seconds_left = self.seconds_left()
+        if seconds_left is not None and seconds_left <= 0:
+            return "stop", 0, "deadline reached"
+
+        if complexity_remaining is not None and complexity_remaining < self.complexity_reserve:
+            wait = reset_in_seconds or 0
+            # Only wait for the budget to reset if we would still have time left to write afterwards
+            if seconds_left is None or wait < seconds_left:
+                return "wait", wait, f"complexity budget low ({complexity_remaining} left)"
+            return "stop", 0, f"complexity budget low ({complexity_remaining} left) and resets after the deadline"
+
+        return "continue", 0, ""